@@ -17,7 +17,7 @@ if PROJECT_ROOT not in sys.path:
 from src.data.loaders import load_vulnerability, load_geojson
 from src.data.real_data_fetcher import fetch_and_prepare
 from src.models.risk_engine import compute_all_kpis
-from src.ui.theme import get_custom_css, COLORS
+from src.ui.theme import COLORS
 from src.ui.pages import (
     render_overview,
     render_heat_air,
@@ -56,9 +56,6 @@ def main():
         if _k not in st.session_state:
             st.session_state[_k] = _v
 
-    # Inject custom CSS
-    st.markdown(get_custom_css(), unsafe_allow_html=True)
-
     # --- Sidebar ---
     with st.sidebar:
         # Logo & title — clicking natively navigates to root (Overview)
@@ -1,5 +1,8 @@
-import sys
-sys.path.insert(0, '.')
+"""
+Live smoke check: fetch the last 7 days and run the full KPI pipeline.
+Needs the project installed (pip install -e .): python scripts/validate_live.py
+"""
+
 from datetime import datetime, timedelta
 from src.data.real_data_fetcher import fetch_and_prepare
 from src.models.risk_engine import compute_all_kpis
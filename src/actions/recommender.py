@@ -4,6 +4,7 @@ Generates action recommendations per spec section 7.
 Each action includes a 'trigger' field explaining the quantitative reason.
 """
 
+import pandas as pd
 from typing import Dict, List, Any
 
 
@@ -216,6 +217,11 @@ def get_hospital_actions(alert_level: str, drivers, icu_strain: int, kpis: Dict
     return actions
 
 
+def top_vulnerable_districts(df_vuln: pd.DataFrame, n: int = 5) -> List[str]:
+    """Names of the n most vulnerable districts, highest vulnerability_score first."""
+    return df_vuln.nlargest(n, "vulnerability_score")["district_name"].tolist()
+
+
 def get_all_actions(
     alert_level: str,
     drivers,
@@ -3,6 +3,7 @@ Data loaders for HEATWATCH+ Demo.
 Loads data from JSON/CSV files in the data/ directory.
 """
 
+import csv
 import json
 import os
 import pandas as pd
@@ -11,6 +12,9 @@ from typing import Dict, Any
 # Base data directory (relative to project root)
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
 
+# ISO dates in every CSV — an explicit format skips pandas' per-file format inference
+_DATE_FORMAT = "%Y-%m-%d"
+
 
 def _data_path(*parts: str) -> str:
     """Construct path relative to data directory."""
@@ -27,14 +31,14 @@ def load_kpis() -> Dict[str, Any]:
 def load_env_timeseries() -> pd.DataFrame:
     """Load environmental timeseries CSV."""
     path = _data_path("simulated", "baseline_env_timeseries.csv")
-    df = pd.read_csv(path, parse_dates=["date"])
+    df = pd.read_csv(path, parse_dates=["date"], date_format=_DATE_FORMAT)
     return df
 
 
 def load_micro_signals() -> pd.DataFrame:
     """Load micro signals CSV."""
     path = _data_path("simulated", "baseline_micro_signals.csv")
-    df = pd.read_csv(path, parse_dates=["date"])
+    df = pd.read_csv(path, parse_dates=["date"], date_format=_DATE_FORMAT)
     return df
 
 
@@ -45,6 +49,26 @@ def load_vulnerability() -> pd.DataFrame:
     return df
 
 
+# Simulated CSVs countable with count_rows()
+_CSV_FILES = {
+    "env_timeseries": "baseline_env_timeseries.csv",
+    "micro_signals": "baseline_micro_signals.csv",
+    "vulnerability": "baseline_vulnerability.csv",
+}
+
+
+def count_rows(name: str) -> int:
+    """
+    Count data rows in a simulated CSV (header excluded) without building a DataFrame.
+    Records are split by the csv module, so quoted fields with embedded newlines
+    count once and blank lines not at all, matching pd.read_csv.
+    """
+    if name not in _CSV_FILES:
+        raise ValueError(f"Unknown CSV: {name!r} (expected one of {', '.join(_CSV_FILES)})")
+    with open(_data_path("simulated", _CSV_FILES[name]), newline="", encoding="utf-8") as f:
+        return max(sum(1 for row in csv.reader(f) if row) - 1, 0)
+
+
 def load_geojson() -> Dict[str, Any]:
     """Load Ankara districts GeoJSON."""
     path = _data_path("geo", "ankara_districts.geojson")
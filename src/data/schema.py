@@ -4,7 +4,7 @@ Defines expected structure for all data contracts.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 # ---------- KPI Schema ----------
@@ -74,6 +74,50 @@ class KPIData:
     drivers: List[str]
 
 
+@dataclass(slots=True)
+class KpiView:
+    """
+    Flat, read-only view of the nested KPI dict for the page renderers.
+    Unpacks every value once, with the fallbacks the pages display when a
+    section is missing.
+    """
+    hr_value: int = 0
+    hr_level: str = ""
+    hr_delta: int = 0
+    sp_value_pct: int = 0
+    sp_delta: int = 0
+    sp_subtitle: str = ""
+    cs_value: float = 0
+    cs_convergence: bool = False
+    icu_strain_pct: int = 0
+    icu_peak_date: str = "N/A"
+    alert_value: str = "WATCH"
+    alert_reason: str = ""
+
+    @classmethod
+    def from_dict(cls, kpis: Dict[str, Any]) -> "KpiView":
+        kpi_data = kpis.get("kpis", {})
+        hr = kpi_data.get("heat_respiratory_risk_index", {})
+        sp = kpi_data.get("respiratory_disease_surge_probability", {})
+        cs = kpi_data.get("combined_respiratory_stress_index", {})
+        icu = kpi_data.get("icu_dual_load_risk", {})
+        al = kpi_data.get("alert_level", {})
+        return cls(
+            hr_value=hr.get("value", 0),
+            hr_level=hr.get("level", ""),
+            hr_delta=hr.get("delta_48h", 0),
+            sp_value_pct=sp.get("value_pct", 0),
+            sp_delta=sp.get("delta_48h", 0),
+            sp_subtitle=sp.get("subtitle", ""),
+            cs_value=cs.get("value", 0),
+            cs_convergence=bool(cs.get("convergence")),
+            icu_strain_pct=icu.get("icu_strain_pct", 0),
+            icu_peak_date=icu.get("peak_date", "N/A"),
+            alert_value=al.get("value", "WATCH"),
+            alert_reason=al.get("reason", ""),
+        )
+
+
 # ---------- CSV Column Definitions ----------
 
 ENV_TIMESERIES_COLUMNS = [
@@ -94,3 +138,46 @@ VALID_ALERT_LEVELS = ["WATCH", "WARNING", "EMERGENCY"]
 
 # Valid risk levels
 VALID_RISK_LEVELS = ["High", "Med", "Low"]
+
+
+# ---------- KPI JSON Schema ----------
+
+def _obj(properties: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": required}
+
+
+_PERCENT = {"type": "number", "minimum": 0, "maximum": 100}
+
+KPI_SCHEMA = _obj(
+    {
+        "location": _obj({}, ["country", "city", "district"]),
+        "period": _obj({}, ["start", "end", "forecast_days"]),
+        "kpis": _obj(
+            {
+                "heat_respiratory_risk_index": _obj(
+                    {"value": _PERCENT, "level": {"enum": VALID_RISK_LEVELS}},
+                    ["value", "level", "delta_48h"],
+                ),
+                "respiratory_disease_surge_probability": _obj(
+                    {"value_pct": _PERCENT, "subtitle": {"type": "string"}},
+                    ["value_pct", "subtitle"],
+                ),
+                "combined_respiratory_stress_index": _obj(
+                    {"value": {"type": "number", "minimum": 0.0, "maximum": 1.0}},
+                    ["value"],
+                ),
+                "icu_dual_load_risk": _obj({}, []),
+                "alert_level": _obj({"value": {"enum": VALID_ALERT_LEVELS}}, ["value"]),
+            },
+            [
+                "heat_respiratory_risk_index",
+                "respiratory_disease_surge_probability",
+                "combined_respiratory_stress_index",
+                "icu_dual_load_risk",
+                "alert_level",
+            ],
+        ),
+        "drivers": {"type": "array"},
+    },
+    ["location", "period", "data_mode", "last_update", "kpis", "drivers"],
+)
@@ -3,82 +3,68 @@ Data validators for HEATWATCH+ Demo.
 Validates loaded data against schemas.
 """
 
+import functools
+import weakref
+import fastjsonschema
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 
 from src.data.schema import (
+    KPI_SCHEMA,
     ENV_TIMESERIES_COLUMNS,
     MICRO_SIGNALS_COLUMNS,
     VULNERABILITY_COLUMNS,
-    VALID_ALERT_LEVELS,
-    VALID_RISK_LEVELS,
 )
 
+# Validated frames are treated as immutable: revalidating the same frame, with
+# the same shape and columns, returns the cached errors. Frames are held weakly,
+# so an entry goes away with its frame.
+_memo_caches: List[Dict[int, tuple]] = []
+_FrameValidator = Callable[[pd.DataFrame], List[str]]
 
-def validate_kpi_json(data: Dict[str, Any]) -> List[str]:
-    """Validate KPI JSON structure. Returns list of error messages (empty = valid)."""
-    errors = []
 
-    # Top-level keys
-    required_top = ["location", "period", "data_mode", "last_update", "kpis", "drivers"]
-    for key in required_top:
-        if key not in data:
-            errors.append(f"Missing top-level key: '{key}'")
-
-    if "location" in data:
-        for k in ["country", "city", "district"]:
-            if k not in data["location"]:
-                errors.append(f"Missing location.{k}")
-
-    if "period" in data:
-        for k in ["start", "end", "forecast_days"]:
-            if k not in data["period"]:
-                errors.append(f"Missing period.{k}")
-
-    if "kpis" in data:
-        kpis = data["kpis"]
-        kpi_keys = [
-            "heat_respiratory_risk_index",
-            "respiratory_disease_surge_probability",
-            "combined_respiratory_stress_index",
-            "icu_dual_load_risk",
-            "alert_level",
-        ]
-        for k in kpi_keys:
-            if k not in kpis:
-                errors.append(f"Missing kpis.{k}")
-
-        # Range checks
-        if "heat_respiratory_risk_index" in kpis:
-            v = kpis["heat_respiratory_risk_index"].get("value", -1)
-            if not (0 <= v <= 100):
-                errors.append(f"heat_respiratory_risk_index.value={v} out of range [0,100]")
-            lvl = kpis["heat_respiratory_risk_index"].get("level", "")
-            if lvl not in VALID_RISK_LEVELS:
-                errors.append(f"Invalid risk level: '{lvl}'")
-
-        if "respiratory_disease_surge_probability" in kpis:
-            v = kpis["respiratory_disease_surge_probability"].get("value_pct", -1)
-            if not (0 <= v <= 100):
-                errors.append(f"surge_probability.value_pct={v} out of range [0,100]")
-
-        if "combined_respiratory_stress_index" in kpis:
-            v = kpis["combined_respiratory_stress_index"].get("value", -1)
-            if not (0.0 <= v <= 1.0):
-                errors.append(f"combined_stress.value={v} out of range [0,1]")
-
-        if "alert_level" in kpis:
-            v = kpis["alert_level"].get("value", "")
-            if v not in VALID_ALERT_LEVELS:
-                errors.append(f"Invalid alert_level: '{v}'")
-
-    if "drivers" in data:
-        if not isinstance(data["drivers"], list):
-            errors.append("drivers must be a list")
+def _memoize_by_identity(func: _FrameValidator) -> _FrameValidator:
+    """Cache a validator's errors per DataFrame (keyed on id, shape and columns, checked with `is`)."""
+    cache: Dict[int, tuple] = {}
+    _memo_caches.append(cache)
+
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame) -> List[str]:
+        key = id(df)
+        layout = (df.shape, tuple(df.columns))
+        hit = cache.get(key)
+        if hit is None or hit[0]() is not df or hit[1] != layout:
+            ref = weakref.ref(df, lambda _, key=key: cache.pop(key, None))
+            hit = cache[key] = (ref, layout, tuple(func(df)))
+        # Fresh list so callers can't corrupt the cached result
+        return list(hit[2])
+
+    return wrapper
 
-    return errors
 
+def clear_validation_cache() -> None:
+    """Forget every memoized validation result (e.g. after editing a validated frame's values)."""
+    for cache in _memo_caches:
+        cache.clear()
 
+
+# Compiled once at import into a plain Python validation function
+_validate_kpi_schema = fastjsonschema.compile(KPI_SCHEMA)
+
+
+def validate_kpi_json(data: Dict[str, Any]) -> List[str]:
+    """
+    Validate KPI JSON structure against KPI_SCHEMA.
+    Returns list of error messages (empty = valid); validation stops at the first error.
+    """
+    try:
+        _validate_kpi_schema(data)
+    except fastjsonschema.JsonSchemaException as e:
+        return [e.message]
+    return []
+
+
+@_memoize_by_identity
 def validate_env_timeseries(df: pd.DataFrame) -> List[str]:
     """Validate environmental timeseries DataFrame."""
     errors = []
@@ -90,6 +76,7 @@ def validate_env_timeseries(df: pd.DataFrame) -> List[str]:
     return errors
 
 
+@_memoize_by_identity
 def validate_micro_signals(df: pd.DataFrame) -> List[str]:
     """Validate micro signals DataFrame."""
     errors = []
@@ -101,6 +88,7 @@ def validate_micro_signals(df: pd.DataFrame) -> List[str]:
     return errors
 
 
+@_memoize_by_identity
 def validate_vulnerability(df: pd.DataFrame) -> List[str]:
     """Validate vulnerability DataFrame."""
     errors = []
@@ -1,11 +1,15 @@
 """
 Risk Engine for HEATWATCH+ Demo.
 All formulas from spec section 6.
+
+The per-day scoring functions work elementwise on NumPy arrays as well as
+on scalars, so a whole forecast window can be scored in one pass. Scalar
+inputs still return plain Python numbers.
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
 
@@ -16,9 +20,27 @@ def _sigmoid(x: float) -> float:
 
 def _normalize(value: float, min_val: float, max_val: float) -> float:
     """Normalize value to 0-100 range."""
+    value = np.asarray(value, dtype=float)
     if max_val == min_val:
-        return 50.0
-    return max(0.0, min(100.0, (value - min_val) / (max_val - min_val) * 100.0))
+        scaled = np.full_like(value, 50.0)
+    else:
+        scaled = np.clip((value - min_val) / (max_val - min_val) * 100.0, 0.0, 100.0)
+        # Missing readings saturate to 100, as min(100, max(0, nan)) always did
+        scaled = np.nan_to_num(scaled, nan=100.0)
+    return float(scaled) if scaled.ndim == 0 else scaled
+
+
+def _round_clip(value: float, lo: int, hi: int) -> int:
+    """
+    Round to the nearest integer and clamp to [lo, hi].
+    NaN raises ValueError on scalars and arrays alike, as int(round(nan)) does.
+    """
+    clipped = np.clip(np.round(value), lo, hi)
+    if np.isnan(clipped).any():
+        raise ValueError("cannot convert float NaN to integer")
+    if np.ndim(clipped) == 0:
+        return int(clipped)
+    return clipped.astype(int)
 
 
 def compute_heat_score(temp_c: float, nighttime_temp_c: float) -> float:
@@ -64,7 +86,7 @@ def compute_heat_respiratory_risk_index(
         + 0.25 * vulnerability_score
         + 0.15 * micro_signal_score
     )
-    return int(max(0, min(100, round(risk))))
+    return _round_clip(risk, 0, 100)
 
 
 def compute_respiratory_surge_probability(
@@ -80,7 +102,7 @@ def compute_respiratory_surge_probability(
     a, b, c = 0.06, 0.05, 0.08
     x = a * (micro_signal_score - 50) + b * (pm25 - 35) + c * (nighttime_temp - 18)
     p = _sigmoid(x)
-    return int(max(0, min(100, round(p * 100))))
+    return _round_clip(p * 100, 0, 100)
 
 
 def compute_combined_stress(heat_resp_risk: int, surge_prob: int) -> float:
@@ -88,7 +110,10 @@ def compute_combined_stress(heat_resp_risk: int, surge_prob: int) -> float:
     Combined = 0.6*(HeatRespRisk/100) + 0.4*(SurgeProb/100)
     Returns: float 0.0-1.0
     """
-    return round(0.6 * (heat_resp_risk / 100.0) + 0.4 * (surge_prob / 100.0), 2)
+    combined = 0.6 * (np.asarray(heat_resp_risk) / 100.0) + 0.4 * (np.asarray(surge_prob) / 100.0)
+    if np.ndim(combined) == 0:
+        return round(float(combined), 2)
+    return np.round(combined, 2)
 
 
 def compute_icu_strain(heat_resp_risk: int, surge_prob: int) -> int:
@@ -97,7 +122,18 @@ def compute_icu_strain(heat_resp_risk: int, surge_prob: int) -> int:
     Clamped to 0-40.
     """
     strain = 5 + 0.25 * heat_resp_risk + 0.15 * surge_prob
-    return int(max(0, min(40, round(strain))))
+    return _round_clip(strain, 0, 40)
+
+
+_ALERT_THRESHOLDS = {
+    "watch_heat_risk": 55,
+    "warning_heat_risk": 70,
+    "emergency_heat_risk": 85,
+    "watch_surge_prob": 35,
+    "warning_surge_prob": 55,
+    "emergency_surge_prob": 70,
+    "emergency_icu_strain": 30,
+}
 
 
 def compute_alert_level(
@@ -112,15 +148,7 @@ def compute_alert_level(
     Returns: {"value": ..., "reason": ...}
     """
     if thresholds is None:
-        thresholds = {
-            "watch_heat_risk": 55,
-            "warning_heat_risk": 70,
-            "emergency_heat_risk": 85,
-            "watch_surge_prob": 35,
-            "warning_surge_prob": 55,
-            "emergency_surge_prob": 70,
-            "emergency_icu_strain": 30,
-        }
+        thresholds = _ALERT_THRESHOLDS
 
     # Check EMERGENCY first
     reasons = []
@@ -151,6 +179,62 @@ def compute_alert_level(
     return {"value": "NORMAL", "reason": "All indicators within normal range"}
 
 
+def _reason_table(reasons: List[str]) -> np.ndarray:
+    """Joined reason text for every bitmask over reasons (bit i -> reasons[i])."""
+    return np.array([
+        " + ".join(r for bit, r in enumerate(reasons) if mask >> bit & 1)
+        for mask in range(1 << len(reasons))
+    ], dtype=object)
+
+
+_EMERGENCY_REASONS = _reason_table(
+    ["Heat-Respiratory Risk Critical", "Surge Probability Critical", "ICU Strain Critical"]
+)
+_WARNING_REASONS = _reason_table(
+    ["Elevated Heat-Respiratory Risk", "Elevated Surge Probability", "Multi-signal Threshold"]
+)
+
+
+def compute_alert_level_vec(
+    heat_resp_risk: np.ndarray,
+    surge_prob: np.ndarray,
+    combined: np.ndarray,
+    icu_strain: np.ndarray,
+    thresholds: Dict[str, int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Elementwise compute_alert_level over arrays.
+    Returns: (levels, reasons) object arrays, same rules and text as the scalar version.
+    """
+    if thresholds is None:
+        thresholds = _ALERT_THRESHOLDS
+    hrr = np.asarray(heat_resp_risk)
+    sp = np.asarray(surge_prob)
+    combined = np.asarray(combined)
+    icu = np.asarray(icu_strain)
+
+    emergency = (
+        (hrr >= thresholds["emergency_heat_risk"]) * 1
+        | (sp >= thresholds["emergency_surge_prob"]) * 2
+        | (icu >= thresholds["emergency_icu_strain"]) * 4
+    )
+    warning = (
+        (hrr >= thresholds["warning_heat_risk"]) * 1
+        | (sp >= thresholds["warning_surge_prob"]) * 2
+        | (combined >= 0.65) * 4
+    )
+    watch = (hrr >= thresholds["watch_heat_risk"]) | (sp >= thresholds["watch_surge_prob"])
+
+    conditions = [emergency > 0, warning > 0, watch]
+    levels = np.select(conditions, ["EMERGENCY", "WARNING", "WATCH"], default="NORMAL").astype(object)
+    reasons = np.select(
+        conditions,
+        [_EMERGENCY_REASONS[emergency], _WARNING_REASONS[warning], "Elevated Indicators"],
+        default="All indicators within normal range",
+    )
+    return levels, reasons
+
+
 def identify_drivers(
     df_env: pd.DataFrame,
     df_micro: pd.DataFrame,
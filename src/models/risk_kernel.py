@@ -0,0 +1,40 @@
+"""
+Fused ICU projection kernel for HEATWATCH+ Demo.
+Scores a whole forecast window in one call using the risk engine formulas.
+"""
+
+import numpy as np
+
+from src.models.risk_engine import (
+    compute_heat_score,
+    compute_pollution_score,
+    compute_micro_signal_score,
+    compute_heat_respiratory_risk_index,
+    compute_respiratory_surge_probability,
+    compute_icu_strain,
+)
+
+
+def project_icu(
+    temp: np.ndarray,
+    night: np.ndarray,
+    pm25: np.ndarray,
+    sym: np.ndarray,
+    pharm: np.ndarray,
+    clinic: np.ndarray,
+    vuln: float,
+) -> np.ndarray:
+    """
+    Projected ICU strain % per day.
+    Chains heat/pollution/micro scores -> HeatRespRisk + SurgeProb -> ICU strain.
+    Returns: float64 array, one value per day, clamped to 0-40.
+    """
+    heat_score = compute_heat_score(temp, night)
+    pollution_score = compute_pollution_score(pm25)
+    micro_signal_score = compute_micro_signal_score(sym, pharm, clinic)
+
+    heat_resp_risk = compute_heat_respiratory_risk_index(
+        heat_score, pollution_score, vuln, micro_signal_score
+    )
+    surge_prob = compute_respiratory_surge_probability(micro_signal_score, pm25, night)
+    return np.asarray(compute_icu_strain(heat_resp_risk, surge_prob), dtype=np.float64)
@@ -1,19 +1,52 @@
 """
 Reusable UI components for HEATWATCH+ Demo.
-All HTML is rendered as single-line strings to prevent Streamlit markdown escaping.
+All HTML is rendered as single-line strings and emitted with st.html,
+which injects it directly instead of running it through the markdown parser.
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import st_folium
+import numpy as np
 import pandas as pd
 import json
-import copy
 from typing import Dict, Any, List, Optional
 
 from src.ui.theme import COLORS, LEVEL_COLORS, ALERT_COLORS, get_plotly_layout
 
+# Trend chart layouts are static — build them once at import.
+# go.Figure copies the layout, so sharing these dicts is safe.
+_LAYOUT_ENV = get_plotly_layout("Environmental Trends")
+_LAYOUT_MICRO = get_plotly_layout("Population Micro-Signals")
+
+
+def _cached_html(name: str, key: tuple, build) -> str:
+    """
+    Return HTML for a static component, rebuilding it only when its inputs change.
+    Results are kept per session in st.session_state["_cache_<name>"], keyed by the input tuple.
+    """
+    slot = f"_cache_{name}"
+    cache = st.session_state.get(slot)
+    if cache is None or len(cache) > 64:
+        cache = {}
+        st.session_state[slot] = cache
+    html = cache.get(key)
+    if html is None:
+        html = build()
+        cache[key] = html
+    return html
+
+
+def _top_bar_html(breadcrumb: str, start: str, end: str, forecast_days: Any) -> str:
+    """Build the static part of the top bar (everything except the last-update clock)."""
+    return (
+        f'<div style="background:linear-gradient(135deg,{COLORS["bg_card"]} 0%,#0d1845 100%);'
+        f'border:1px solid {COLORS["border"]};border-radius:10px;padding:12px 20px;margin-bottom:16px;'
+        f'display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:8px;">'
+        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">📍 <strong style="color:{COLORS["text_primary"]};">{breadcrumb}</strong></span>'
+        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">📅 {start} → {end}</span>'
+        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">🔮 Forecast: <strong style="color:{COLORS["text_primary"]};">{forecast_days} days</strong></span>'
+        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">💾 Data: <strong style="color:{COLORS["text_primary"]};">Meteostat + AQICN Pattern</strong></span>'
+    )
+
 
 def render_top_bar(kpis: Dict[str, Any]):
     """Render the top navigation/info bar."""
@@ -25,26 +58,56 @@ def render_top_bar(kpis: Dict[str, Any]):
     last_update = _dt.now().strftime("%Y-%m-%d %H:%M:%S")
 
     breadcrumb = f"{location.get('country', '')} › {location.get('city', '')}"
+    key = (breadcrumb, period.get("start", ""), period.get("end", ""), period.get("forecast_days", 7))
+    head = _cached_html("top_bar", key, lambda: _top_bar_html(*key))
 
     html = (
-        f'<div style="background:linear-gradient(135deg,{COLORS["bg_card"]} 0%,#0d1845 100%);'
-        f'border:1px solid {COLORS["border"]};border-radius:10px;padding:12px 20px;margin-bottom:16px;'
-        f'display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:8px;">'
-        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">📍 <strong style="color:{COLORS["text_primary"]};">{breadcrumb}</strong></span>'
-        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">📅 {period.get("start", "")} → {period.get("end", "")}</span>'
-        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">🔮 Forecast: <strong style="color:{COLORS["text_primary"]};">{period.get("forecast_days", 7)} days</strong></span>'
-        f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">💾 Data: <strong style="color:{COLORS["text_primary"]};">Meteostat + AQICN Pattern</strong></span>'
+        f'{head}'
         f'<span style="color:{COLORS["text_secondary"]};font-size:13px;">🕐 Last Update: <strong style="color:{COLORS["accent_cyan"]};">{last_update}</strong></span>'
         f'</div>'
     )
-    st.markdown(html, unsafe_allow_html=True)
-
-
-
-def kpi_card(title: str, value: Any, subtitle: str = "", delta: str = "",
-             level: str = "", bar_value: int = 0, unit: str = "",
-             scale_hint: str = ""):
-    """Render a single KPI card with value, level, delta, risk bar, and optional scale hint."""
+    st.html(html)
+
+
+
+# KPI card templates — COLORS are bound at import, only per-card values are filled at render
+_SCALE_HINT_TMPL = (
+    f'<div style="font-size:9px;color:{COLORS["text_muted"]};margin-top:2px;'
+    f'font-style:italic;opacity:0.7;">{{scale_hint}}</div>'
+)
+_LEVEL_BADGE_TMPL = (
+    '<span style="display:inline-block;padding:2px 10px;border-radius:12px;font-size:11px;'
+    'font-weight:600;background:{color}20;color:{color};'
+    'border:1px solid {color}40;margin-bottom:6px;">{level}</span><br>'
+)
+_DELTA_TMPL = f'<div style="font-size:12px;color:{COLORS["text_secondary"]};margin-bottom:6px;">{{delta}}</div>'
+_SUBTITLE_TMPL = f'<div style="font-size:10px;color:{COLORS["text_muted"]};margin-bottom:6px;line-height:1.3;">{{subtitle}}</div>'
+_BAR_TMPL = (
+    f'<div style="margin-top:6px;">'
+    f'<div style="width:100%;height:6px;background:linear-gradient(to right,'
+    f'{COLORS["gradient_green"]} 0%,{COLORS["gradient_yellow"]} 33%,'
+    f'{COLORS["gradient_orange"]} 66%,{COLORS["gradient_red"]} 100%);'
+    f'border-radius:3px;position:relative;">'
+    f'<div style="position:absolute;top:-4px;left:{{marker_pos}}%;width:4px;height:14px;'
+    f'background:white;border-radius:2px;box-shadow:0 0 4px rgba(255,255,255,0.5);"></div></div>'
+    f'<div style="display:flex;justify-content:space-between;font-size:10px;color:{COLORS["text_muted"]};margin-top:4px;">'
+    f'<span>0</span><span>100</span></div></div>'
+)
+_KPI_TMPL = (
+    f'<div style="background:linear-gradient(145deg,{COLORS["bg_card"]} 0%,#0f1540 100%);'
+    f'border:1px solid {COLORS["border"]};border-radius:12px;padding:18px 16px 14px 16px;'
+    f'text-align:center;height:100%;">'
+    f'<div style="font-size:11px;font-weight:600;text-transform:uppercase;letter-spacing:0.8px;'
+    f'color:{COLORS["text_muted"]};margin-bottom:8px;">{{title}}</div>'
+    f'{{scale_html}}'
+    f'<div style="font-size:36px;font-weight:700;color:{{value_color}};margin:4px 0;">{{value}}{{unit}}</div>'
+    f'{{level_html}}{{delta_html}}{{subtitle_html}}{{bar_html}}</div>'
+)
+
+
+def _kpi_card_html(title: str, value: Any, subtitle: str, delta: str,
+                   level: str, bar_value: int, unit: str, scale_hint: str) -> str:
+    """Build the HTML for a single KPI card."""
     level_color = LEVEL_COLORS.get(level, COLORS["text_secondary"])
 
     # Value color based on risk
@@ -58,61 +121,34 @@ def kpi_card(title: str, value: Any, subtitle: str = "", delta: str = "",
     else:
         value_color = COLORS["text_primary"]
 
-    # Scale hint line (e.g. "Scale: 0–100 normalized composite index")
-    scale_html = ""
-    if scale_hint:
-        scale_html = (
-            f'<div style="font-size:9px;color:{COLORS["text_muted"]};margin-top:2px;'
-            f'font-style:italic;opacity:0.7;">{scale_hint}</div>'
-        )
-
-    # Build HTML parts
-    level_html = ""
-    if level:
-        level_html = (
-            f'<span style="display:inline-block;padding:2px 10px;border-radius:12px;font-size:11px;'
-            f'font-weight:600;background:{level_color}20;color:{level_color};'
-            f'border:1px solid {level_color}40;margin-bottom:6px;">{level}</span><br>'
-        )
+    return _KPI_TMPL.format(
+        title=title,
+        scale_html=_SCALE_HINT_TMPL.format(scale_hint=scale_hint) if scale_hint else "",
+        value_color=value_color,
+        value=value,
+        unit=unit,
+        level_html=_LEVEL_BADGE_TMPL.format(color=level_color, level=level) if level else "",
+        delta_html=_DELTA_TMPL.format(delta=delta) if delta else "",
+        subtitle_html=_SUBTITLE_TMPL.format(subtitle=subtitle) if subtitle else "",
+        bar_html=_BAR_TMPL.format(marker_pos=max(0, min(98, bar_value))) if bar_value > 0 else "",
+    )
 
-    delta_html = ""
-    if delta:
-        delta_html = f'<div style="font-size:12px;color:{COLORS["text_secondary"]};margin-bottom:6px;">{delta}</div>'
-
-    subtitle_html = ""
-    if subtitle:
-        subtitle_html = f'<div style="font-size:10px;color:{COLORS["text_muted"]};margin-bottom:6px;line-height:1.3;">{subtitle}</div>'
-
-    bar_html = ""
-    if bar_value > 0:
-        marker_pos = max(0, min(98, bar_value))
-        bar_html = (
-            f'<div style="margin-top:6px;">'
-            f'<div style="width:100%;height:6px;background:linear-gradient(to right,'
-            f'{COLORS["gradient_green"]} 0%,{COLORS["gradient_yellow"]} 33%,'
-            f'{COLORS["gradient_orange"]} 66%,{COLORS["gradient_red"]} 100%);'
-            f'border-radius:3px;position:relative;">'
-            f'<div style="position:absolute;top:-4px;left:{marker_pos}%;width:4px;height:14px;'
-            f'background:white;border-radius:2px;box-shadow:0 0 4px rgba(255,255,255,0.5);"></div></div>'
-            f'<div style="display:flex;justify-content:space-between;font-size:10px;color:{COLORS["text_muted"]};margin-top:4px;">'
-            f'<span>0</span><span>100</span></div></div>'
-        )
 
-    html = (
-        f'<div style="background:linear-gradient(145deg,{COLORS["bg_card"]} 0%,#0f1540 100%);'
-        f'border:1px solid {COLORS["border"]};border-radius:12px;padding:18px 16px 14px 16px;'
-        f'text-align:center;height:100%;">'
-        f'<div style="font-size:11px;font-weight:600;text-transform:uppercase;letter-spacing:0.8px;'
-        f'color:{COLORS["text_muted"]};margin-bottom:8px;">{title}</div>'
-        f'{scale_html}'
-        f'<div style="font-size:36px;font-weight:700;color:{value_color};margin:4px 0;">{value}{unit}</div>'
-        f'{level_html}{delta_html}{subtitle_html}{bar_html}</div>'
+def kpi_card(title: str, value: Any, subtitle: str = "", delta: str = "",
+             level: str = "", bar_value: int = 0, unit: str = "",
+             scale_hint: str = ""):
+    """Render a single KPI card with value, level, delta, risk bar, and optional scale hint."""
+    # type(value) keeps 15 and 15.0 apart — they hash equal but render differently
+    key = (title, type(value), value, subtitle, delta, level, bar_value, unit, scale_hint)
+    html = _cached_html(
+        "kpi_card", key,
+        lambda: _kpi_card_html(title, value, subtitle, delta, level, bar_value, unit, scale_hint),
     )
-    st.markdown(html, unsafe_allow_html=True)
+    st.html(html)
 
 
-def alert_banner(level: str, reason: str):
-    """Render colored alert banner with threshold legend."""
+def _alert_banner_html(level: str, reason: str) -> str:
+    """Build the HTML for the alert banner and its threshold legend."""
     colors = ALERT_COLORS.get(level, ALERT_COLORS.get("WATCH", {"bg": "#1a237e20", "border": "#42a5f5", "text": "#42a5f5"}))
     icons = {"NORMAL": "✅", "WATCH": "👁️", "WARNING": "⚠️", "EMERGENCY": "🚨"}
     icon = icons.get(level, "ℹ️")
@@ -141,7 +177,64 @@ def alert_banner(level: str, reason: str):
         f'<div style="display:flex;flex-wrap:wrap;padding-top:6px;border-top:1px solid {COLORS["border"]};">{legend_html}</div>'
         f'</div>'
     )
-    st.markdown(html, unsafe_allow_html=True)
+    return html
+
+
+def alert_banner(level: str, reason: str):
+    """Render colored alert banner with threshold legend."""
+    html = _cached_html("alert_banner", (level, reason), lambda: _alert_banner_html(level, reason))
+    st.html(html)
+
+
+# Choropleth colors for scores below 35 / 55 / 75 / above
+_MAP_PALETTE = np.array(["#43a047", "#fdd835", "#fb8c00", "#e53935"])
+_MAP_BINS = [35, 55, 75]
+
+
+@st.cache_data(show_spinner=False)
+def _map_features(geojson_data: Dict, vuln_df: pd.DataFrame, metric_col: str) -> List[Dict[str, Any]]:
+    """
+    Enrich district features for the choropleth (cached).
+    Keyed on the metric column rather than the layer label, so layers that
+    share a metric reuse the same result.
+    Each feature is rebuilt with only the displayed properties — every property
+    is serialized into the Leaflet JS payload — and carries its fill color and tooltip.
+    """
+    # Left-join district data onto the GeoJSON features in a single pandas merge
+    feat_df = pd.DataFrame({"district_name": [f["properties"]["district_name"] for f in geojson_data["features"]]})
+    joined = feat_df.merge(
+        vuln_df[["district_name", "vulnerability_score", "current_risk_score", "elderly_pct"]]
+        .drop_duplicates("district_name", keep="last"),
+        on="district_name", how="left",
+    ).fillna({"vulnerability_score": 50, "current_risk_score": 50, "elderly_pct": 15}).astype(
+        {"vulnerability_score": float, "current_risk_score": float, "elderly_pct": float}
+    )
+    joined["score"] = joined[metric_col]
+    joined["color"] = _MAP_PALETTE[np.digitize(joined["score"], _MAP_BINS)].tolist()
+
+    features = []
+    for feature, row in zip(geojson_data["features"], joined.itertuples(index=False)):
+        features.append({
+            "feature": {
+                "type": "Feature",
+                "geometry": feature["geometry"],
+                "properties": {
+                    "district_name": row.district_name,
+                    "score": row.score,
+                    "elderly_pct": row.elderly_pct,
+                    "vulnerability_score": row.vulnerability_score,
+                    "current_risk_score": row.current_risk_score,
+                },
+            },
+            "color": row.color,
+            "tooltip": (
+                f"<b>District:</b> {row.district_name}<br>"
+                f"<b>65+ Population:</b> {row.elderly_pct}%<br>"
+                f"<b>Vulnerability:</b> {row.vulnerability_score}<br>"
+                f"<b>Risk Score:</b> {row.current_risk_score}"
+            ),
+        })
+    return features
 
 
 def map_panel(geojson_data: Dict, vuln_df: pd.DataFrame, layer_mode: str = "Vulnerability"):
@@ -149,8 +242,9 @@ def map_panel(geojson_data: Dict, vuln_df: pd.DataFrame, layer_mode: str = "Vuln
     Render folium choropleth map of Ankara districts.
     layer_mode: 'Vulnerability' | 'Heat Stress' | 'PM2.5' | 'Combined Risk'
     """
-    # Deep copy to avoid mutating cached data
-    geojson = copy.deepcopy(geojson_data)
+    # Imported lazily so pages without a map don't pay folium's import cost
+    import folium
+    from streamlit_folium import st_folium
 
     metric_map = {
         "Vulnerability": "vulnerability_score",
@@ -160,34 +254,9 @@ def map_panel(geojson_data: Dict, vuln_df: pd.DataFrame, layer_mode: str = "Vuln
     }
     metric_col = metric_map.get(layer_mode, "vulnerability_score")
 
-    # Build lookup
-    vuln_dict = {}
-    for _, row in vuln_df.iterrows():
-        vuln_dict[row["district_name"]] = {
-            "vulnerability_score": float(row.get("vulnerability_score", 50)),
-            "current_risk_score": float(row.get("current_risk_score", 50)),
-            "elderly_pct": float(row.get("elderly_pct", 15)),
-        }
-
-    # Enrich GeoJSON
-    for feature in geojson["features"]:
-        name = feature["properties"]["district_name"]
-        data = vuln_dict.get(name, {})
-        score = data.get(metric_col, 50)
-        feature["properties"]["score"] = score
-        feature["properties"]["elderly_pct"] = data.get("elderly_pct", 15)
-        feature["properties"]["vulnerability_score"] = data.get("vulnerability_score", 50)
-        feature["properties"]["current_risk_score"] = data.get("current_risk_score", 50)
-
-    def get_color(score):
-        if score >= 75:
-            return "#e53935"
-        elif score >= 55:
-            return "#fb8c00"
-        elif score >= 35:
-            return "#fdd835"
-        else:
-            return "#43a047"
+    # Cache on the canonical metric column, not the label — the three
+    # vulnerability-based layers share one enrichment result
+    features = _map_features(geojson_data, vuln_df, metric_col)
 
     # Create folium map
     m = folium.Map(
@@ -198,39 +267,49 @@ def map_panel(geojson_data: Dict, vuln_df: pd.DataFrame, layer_mode: str = "Vuln
     )
 
     # Add GeoJSON layer with custom style
-    for feature in geojson["features"]:
-        score = feature["properties"]["score"]
-        color = get_color(score)
-        name = feature["properties"]["district_name"]
-        elderly = feature["properties"]["elderly_pct"]
-        vuln = feature["properties"]["vulnerability_score"]
-        risk = feature["properties"]["current_risk_score"]
-
-        tooltip_text = (
-            f"<b>District:</b> {name}<br>"
-            f"<b>65+ Population:</b> {elderly}%<br>"
-            f"<b>Vulnerability:</b> {vuln}<br>"
-            f"<b>Risk Score:</b> {risk}"
-        )
-
+    for item in features:
         folium.GeoJson(
-            {"type": "Feature", "geometry": feature["geometry"], "properties": feature["properties"]},
-            style_function=lambda x, c=color: {
+            item["feature"],
+            style_function=lambda x, c=item["color"]: {
                 "fillColor": c,
                 "color": "#ffffff",
                 "weight": 1.5,
                 "fillOpacity": 0.65,
             },
-            tooltip=folium.Tooltip(tooltip_text),
+            tooltip=folium.Tooltip(item["tooltip"]),
         ).add_to(m)
 
     st_folium(m, use_container_width=True, height=400, returned_objects=[])
 
 
+# Action row templates — COLORS are bound at import, only per-action values are filled at render
+_TRIGGER_TMPL = (
+    f'<div style="font-size:10px;color:{COLORS["text_muted"]};margin-top:4px;'
+    f'padding-top:4px;border-top:1px solid {COLORS["border"]};font-style:italic;">'
+    f'⚡ {{trigger}}</div>'
+)
+_ACTION_ROW_TMPL = (
+    f'<div style="background:{COLORS["bg_card"]};border:1px solid {COLORS["border"]};'
+    f'border-radius:8px;padding:12px 16px;margin-bottom:8px;">'
+    f'<div style="display:flex;justify-content:space-between;align-items:center;">'
+    f'<div style="flex:1;"><span style="color:{{sev_color}};margin-right:8px;">●</span>'
+    f'<span style="color:{COLORS["text_primary"]};font-size:13px;font-weight:500;">{{action}}</span></div>'
+    f'<div style="display:flex;gap:6px;flex-shrink:0;">'
+    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
+    f'font-weight:600;background:{{badge_bg}};color:{{sev_color}};border:1px solid {{badge_border}};">{{sev}}</span>'
+    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
+    f'font-weight:600;background:#42a5f520;color:#42a5f5;border:1px solid #42a5f540;">{{owner}}</span>'
+    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
+    f'font-weight:600;background:#9c27b020;color:#ce93d8;border:1px solid #9c27b040;">{{eta}}</span>'
+    f'</div></div>'
+    f'{{trigger_html}}</div>'
+)
+
+
 def actions_panel(actions_by_tab: Dict[str, List[Dict[str, Any]]], kpis: Dict[str, Any], compact: bool = False):
 
     """Render the actions panel with tabs and action rows."""
-    st.markdown(
+    st.html(
         f'<div style="margin-bottom:12px;">'
         f'<div style="color:{COLORS["text_primary"]};font-size:16px;font-weight:600;margin-bottom:6px;'
         f'padding-bottom:6px;border-bottom:2px solid {COLORS["accent_blue"]};display:inline-block;">'
@@ -239,8 +318,7 @@ def actions_panel(actions_by_tab: Dict[str, List[Dict[str, Any]]], kpis: Dict[st
         f'<span style="display:flex;align-items:center;gap:4px;"><span style="display:inline-block;width:10px;height:10px;border-radius:50%;background:#f44336;"></span> <b>High:</b> Emergency / Warning</span>'
         f'<span style="display:flex;align-items:center;gap:4px;"><span style="display:inline-block;width:10px;height:10px;border-radius:50%;background:#ff9800;"></span> <b>Med:</b> Watch</span>'
         f'<span style="display:flex;align-items:center;gap:4px;"><span style="display:inline-block;width:10px;height:10px;border-radius:50%;background:#4caf50;"></span> <b>Low:</b> Normal</span>'
-        f'</div></div>',
-        unsafe_allow_html=True,
+        f'</div></div>'
     )
 
     tabs = st.tabs(list(actions_by_tab.keys()))
@@ -260,31 +338,17 @@ def actions_panel(actions_by_tab: Dict[str, List[Dict[str, Any]]], kpis: Dict[st
                     badge_bg, badge_border = "#4caf5020", "#4caf5040"
 
                 trigger = action.get("trigger", "")
-                trigger_html = ""
-                if trigger:
-                    trigger_html = (
-                        f'<div style="font-size:10px;color:{COLORS["text_muted"]};margin-top:4px;'
-                        f'padding-top:4px;border-top:1px solid {COLORS["border"]};font-style:italic;">'
-                        f'⚡ {trigger}</div>'
-                    )
-
-                html = (
-                    f'<div style="background:{COLORS["bg_card"]};border:1px solid {COLORS["border"]};'
-                    f'border-radius:8px;padding:12px 16px;margin-bottom:8px;">'
-                    f'<div style="display:flex;justify-content:space-between;align-items:center;">'
-                    f'<div style="flex:1;"><span style="color:{sev_color};margin-right:8px;">●</span>'
-                    f'<span style="color:{COLORS["text_primary"]};font-size:13px;font-weight:500;">{action["action"]}</span></div>'
-                    f'<div style="display:flex;gap:6px;flex-shrink:0;">'
-                    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
-                    f'font-weight:600;background:{badge_bg};color:{sev_color};border:1px solid {badge_border};">{sev}</span>'
-                    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
-                    f'font-weight:600;background:#42a5f520;color:#42a5f5;border:1px solid #42a5f540;">{action["owner"]}</span>'
-                    f'<span style="display:inline-block;padding:2px 8px;border-radius:10px;font-size:10px;'
-                    f'font-weight:600;background:#9c27b020;color:#ce93d8;border:1px solid #9c27b040;">{action["eta"]}</span>'
-                    f'</div></div>'
-                    f'{trigger_html}</div>'
+                html = _ACTION_ROW_TMPL.format(
+                    sev_color=sev_color,
+                    action=action["action"],
+                    badge_bg=badge_bg,
+                    badge_border=badge_border,
+                    sev=sev,
+                    owner=action["owner"],
+                    eta=action["eta"],
+                    trigger_html=_TRIGGER_TMPL.format(trigger=trigger) if trigger else "",
                 )
-                st.markdown(html, unsafe_allow_html=True)
+                st.html(html)
 
     # ── Shortcut buttons ──────────────────────────────────────
     def _open_sms():
@@ -313,66 +377,165 @@ def actions_panel(actions_by_tab: Dict[str, List[Dict[str, Any]]], kpis: Dict[st
             on_click=_open_briefing,
         )
 
+
+_orjson_configured = False
+
+
+def plotly_chart(fig, key: str):
+    """Render a Plotly figure (go.Figure or plain dict) at full container width."""
+    global _orjson_configured
+    if not _orjson_configured:
+        import plotly.io as pio
+        # st.plotly_chart serializes through plotly.io.to_json — use orjson for it
+        # instead of the much slower PlotlyJSONEncoder. Process-wide, so set once.
+        pio.json.config.default_engine = "orjson"
+        _orjson_configured = True
+    st.plotly_chart(fig, use_container_width=True, key=key)
+
+
+# Line charts never ship more points than this to the browser
+LTTB_MAX_POINTS = 500
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int = LTTB_MAX_POINTS):
+    """
+    Downsample a line series with Largest-Triangle-Three-Buckets.
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    next bucket's mean — which preserves peaks and troughs. Series are assumed
+    evenly spaced, so positions stand in for x. Short series pass through as-is.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    pos = np.arange(n, dtype=float)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = pos[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        area = np.abs(
+            (pos[a] - avg_x) * (y[lo:hi] - y[a])
+            - (pos[a] - pos[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return x[keep], y[keep]
+
+
 def trend_chart_env(df_env: pd.DataFrame):
     """Render environmental trends chart with Plotly."""
-    layout = get_plotly_layout("Environmental Trends")
-
-    fig = go.Figure(layout=layout)
-
-    fig.add_trace(go.Scatter(
-        x=df_env["date"], y=df_env["temp_c"],
-        name="Temp (°C)", mode="lines+markers",
-        line=dict(color="#ef5350", width=2),
-        marker=dict(size=6),
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df_env["date"], y=df_env["pm25_ugm3"],
-        name="PM2.5 (µg/m³)", mode="lines+markers",
-        line=dict(color="#ffa726", width=2),
-        marker=dict(size=6),
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df_env["date"], y=df_env["humidity_pct"],
-        name="Humidity (%)", mode="lines+markers",
-        line=dict(color="#42a5f5", width=2, dash="dot"),
-        marker=dict(size=6),
-    ))
+    import plotly.graph_objects as go
+
+    fig = go.Figure(layout=_LAYOUT_ENV)
+
+    # All three series share the same date axis; each is downsampled on its own
+    x = df_env["date"].to_numpy()
+    temp_x, temp_y = lttb(x, df_env["temp_c"].to_numpy())
+    pm25_x, pm25_y = lttb(x, df_env["pm25_ugm3"].to_numpy())
+    hum_x, hum_y = lttb(x, df_env["humidity_pct"].to_numpy())
+    fig.add_traces([
+        go.Scattergl(
+            x=temp_x, y=temp_y,
+            name="Temp (°C)", mode="lines+markers",
+            line=dict(color="#ef5350", width=2),
+            marker=dict(size=4),
+        ),
+        go.Scattergl(
+            x=pm25_x, y=pm25_y,
+            name="PM2.5 (µg/m³)", mode="lines+markers",
+            line=dict(color="#ffa726", width=2),
+            marker=dict(size=4),
+        ),
+        go.Scattergl(
+            x=hum_x, y=hum_y,
+            name="Humidity (%)", mode="lines+markers",
+            line=dict(color="#42a5f5", width=2, dash="dot"),
+            marker=dict(size=4),
+        ),
+    ])
 
     fig.update_layout(height=300, hovermode="x unified")
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, key="trend_env")
 
 
 def trend_chart_micro(df_micro: pd.DataFrame):
     """Render population micro-signals chart with Plotly."""
-    layout = get_plotly_layout("Population Micro-Signals")
-
-    fig = go.Figure(layout=layout)
-
-    fig.add_trace(go.Scatter(
-        x=df_micro["date"], y=df_micro["symptom_search_index"],
-        name="Symptom Searches (index)", mode="lines+markers",
-        line=dict(color="#26c6da", width=2),
-        marker=dict(size=6),
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df_micro["date"], y=df_micro["pharmacy_visits_index"],
-        name="Pharmacy Visits (index)", mode="lines+markers",
-        line=dict(color="#ab47bc", width=2),
-        marker=dict(size=6),
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df_micro["date"], y=df_micro["clinic_cases_index"],
-        name="Clinic Cases (index)", mode="lines+markers",
-        line=dict(color="#66bb6a", width=2),
-        marker=dict(size=6),
-    ))
+    import plotly.graph_objects as go
+
+    fig = go.Figure(layout=_LAYOUT_MICRO)
+
+    # All three series share the same date axis; each is downsampled on its own
+    x = df_micro["date"].to_numpy()
+    search_x, search_y = lttb(x, df_micro["symptom_search_index"].to_numpy())
+    pharm_x, pharm_y = lttb(x, df_micro["pharmacy_visits_index"].to_numpy())
+    clinic_x, clinic_y = lttb(x, df_micro["clinic_cases_index"].to_numpy())
+    fig.add_traces([
+        go.Scattergl(
+            x=search_x, y=search_y,
+            name="Symptom Searches (index)", mode="lines+markers",
+            line=dict(color="#26c6da", width=2),
+            marker=dict(size=4),
+        ),
+        go.Scattergl(
+            x=pharm_x, y=pharm_y,
+            name="Pharmacy Visits (index)", mode="lines+markers",
+            line=dict(color="#ab47bc", width=2),
+            marker=dict(size=4),
+        ),
+        go.Scattergl(
+            x=clinic_x, y=clinic_y,
+            name="Clinic Cases (index)", mode="lines+markers",
+            line=dict(color="#66bb6a", width=2),
+            marker=dict(size=4),
+        ),
+    ])
 
     fig.update_layout(height=300, hovermode="x unified")
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, key="trend_micro")
+
+
+_DRIVER_ROW_TMPL = (
+    f'<div style="display:flex;align-items:center;justify-content:space-between;'
+    f'padding:8px 0;border-bottom:1px solid {COLORS["border"]};gap:12px;">'
+    f'<span style="color:{COLORS["text_primary"]};font-size:13px;font-weight:500;flex:1;">{{name}}</span>'
+    f'<span style="color:{COLORS["accent_cyan"]};font-size:13px;font-weight:600;min-width:80px;text-align:right;">{{value}}</span>'
+    f'<span style="color:{{change_color}};font-size:12px;font-weight:600;min-width:70px;text-align:right;">{{change_text}}</span>'
+    f'</div>'
+)
+
+
+def _driver_row_html(d: Dict[str, Any]) -> str:
+    """One row of the rich drivers table."""
+    change = d.get("change_pct", 0)
+    direction = d.get("direction", "→")
+
+    # Color based on direction
+    if change > 5:
+        change_color = COLORS["risk_high"]
+    elif change > 0:
+        change_color = COLORS["risk_med"]
+    elif change < -5:
+        change_color = COLORS["risk_low"]
+    else:
+        change_color = COLORS["text_secondary"]
+
+    return _DRIVER_ROW_TMPL.format(
+        name=d.get("name", ""),
+        value=d.get("value", ""),
+        change_color=change_color,
+        change_text=f"{direction} {change:+.1f}%" if change != 0 else "→ stable",
+    )
 
 
 def drivers_footer(drivers):
@@ -397,37 +560,11 @@ def drivers_footer(drivers):
             f'<span style="color:{COLORS["text_muted"]};font-size:12px;font-weight:600;margin-right:12px;">'
             f'Primary Drivers:</span>{tags}</div>'
         )
-        st.markdown(html, unsafe_allow_html=True)
+        st.html(html)
         return
 
     # Rich XAI format
-    rows_html = ""
-    for d in drivers:
-        name = d.get("name", "")
-        value = d.get("value", "")
-        change = d.get("change_pct", 0)
-        direction = d.get("direction", "→")
-
-        # Color based on direction
-        if change > 5:
-            change_color = COLORS["risk_high"]
-        elif change > 0:
-            change_color = COLORS["risk_med"]
-        elif change < -5:
-            change_color = COLORS["risk_low"]
-        else:
-            change_color = COLORS["text_secondary"]
-
-        change_text = f"{direction} {change:+.1f}%" if change != 0 else "→ stable"
-
-        rows_html += (
-            f'<div style="display:flex;align-items:center;justify-content:space-between;'
-            f'padding:8px 0;border-bottom:1px solid {COLORS["border"]};gap:12px;">'
-            f'<span style="color:{COLORS["text_primary"]};font-size:13px;font-weight:500;flex:1;">{name}</span>'
-            f'<span style="color:{COLORS["accent_cyan"]};font-size:13px;font-weight:600;min-width:80px;text-align:right;">{value}</span>'
-            f'<span style="color:{change_color};font-size:12px;font-weight:600;min-width:70px;text-align:right;">{change_text}</span>'
-            f'</div>'
-        )
+    rows_html = "".join(_driver_row_html(d) for d in drivers)
 
     html = (
         f'<div style="background:{COLORS["bg_card"]};border:1px solid {COLORS["border"]};'
@@ -446,4 +583,4 @@ def drivers_footer(drivers):
         f'</div>'
         f'{rows_html}</div>'
     )
-    st.markdown(html, unsafe_allow_html=True)
+    st.html(html)
@@ -4,89 +4,258 @@ Each function renders a complete page in the Streamlit app.
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from src.ui.components import (
     render_top_bar, kpi_card, alert_banner, map_panel,
     actions_panel, trend_chart_env, trend_chart_micro, drivers_footer,
+    plotly_chart, lttb,
 )
-from src.ui.theme import COLORS, get_plotly_layout
-from src.actions.recommender import get_all_actions
+from src.ui.theme import COLORS, get_plotly_layout, inject_css
+from src.data.schema import KpiView
+from src.actions.recommender import get_all_actions, top_vulnerable_districts
 from src.models.signal_fusion import fuse_signals, compute_signal_convergence
 
 
+# Alert level → position of the marker on the KPI card's severity bar
+_ALERT_BAR = {"NORMAL": 15, "WATCH": 40, "WARNING": 70, "EMERGENCY": 95}
+
+# ── ICU capacity table ────────────────────────────────────────
+# Only the ICU beds row depends on the KPIs; the other rows are static and
+# rendered once at import.
+_CAP_TH_STYLE = f'padding:10px 14px;text-align:left;color:{COLORS["text_muted"]};font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:1px;border-bottom:2px solid {COLORS["border"]};'
+_CAP_ROW_TMPL = (
+    f'<tr style="border-bottom:1px solid {COLORS["border"]};">'
+    f'<td style="padding:12px 14px;color:{COLORS["text_primary"]};font-weight:500;">{{name}}</td>'
+    f'<td style="padding:12px 14px;color:{COLORS["text_secondary"]};">{{current}}</td>'
+    f'<td style="padding:12px 14px;color:{COLORS["text_secondary"]};">{{peak}}</td>'
+    f'<td style="padding:12px 14px;color:{{color}};font-weight:600;">{{status}}</td>'
+    f'</tr>'
+)
+_CAP_STATIC_ROWS = "".join(
+    _CAP_ROW_TMPL.format(name=name, current=current, peak=peak, status=status, color=color)
+    for name, current, peak, status, color in [
+        ("Respiratory Ventilators", "18%", "28%", "✅ Normal", COLORS["risk_low"]),
+        ("Oxygen Supply", "65%", "75%", "⚠️ Watch", COLORS["risk_med"]),
+        ("ER Triage Capacity", "45%", "60%", "✅ Normal", COLORS["risk_low"]),
+    ]
+)
+_CAP_TABLE_TMPL = (
+    f'<div style="background:{COLORS["bg_card"]};border:1px solid {COLORS["border"]};border-radius:12px;overflow:hidden;margin-bottom:16px;">'
+    f'<table style="width:100%;border-collapse:collapse;">'
+    f'<thead><tr style="background:{COLORS["bg_sidebar"]};">'
+    f'<th style="{_CAP_TH_STYLE}">Indicator</th>'
+    f'<th style="{_CAP_TH_STYLE}">Current Load</th>'
+    f'<th style="{_CAP_TH_STYLE}">Projected Peak</th>'
+    f'<th style="{_CAP_TH_STYLE}">Status</th>'
+    f'</tr></thead>'
+    f'<tbody>{{rows}}</tbody></table></div>'
+)
+
+
+@st.cache_data(show_spinner=False)
+def _capacity_table_html(icu_strain_pct: int) -> str:
+    """Capacity indicators table; only the ICU beds row varies with strain."""
+    icu_row = _CAP_ROW_TMPL.format(
+        name="ICU Beds (est.)",
+        current=f"{icu_strain_pct}%",
+        peak=f"{min(40, icu_strain_pct + 10)}%",
+        status="⚠️ Watch",
+        color=COLORS["risk_med"],
+    )
+    return _CAP_TABLE_TMPL.format(rows=icu_row + _CAP_STATIC_ROWS)
+
+
+def _hline(y: float, color: str, text: str):
+    """
+    Build a dotted horizontal threshold line and its right-aligned label
+    as plain layout dicts — the same shape/annotation pair fig.add_hline adds.
+    """
+    shape = {
+        "type": "line", "xref": "x domain", "x0": 0, "x1": 1,
+        "yref": "y", "y0": y, "y1": y,
+        "line": {"color": color, "dash": "dot"},
+    }
+    annotation = {
+        "text": text, "showarrow": False,
+        "xref": "x domain", "x": 1, "xanchor": "right",
+        "yref": "y", "y": y, "yanchor": "bottom",
+    }
+    return shape, annotation
+
+
+def _area_trace(x, y, name: str, color: str, fillcolor: str, width: float = 2) -> Dict[str, Any]:
+    """
+    Line + markers trace shaded down to zero. Always scattergl, so the
+    filled area is drawn by WebGL instead of as one large SVG path.
+    """
+    return dict(
+        type="scattergl",
+        x=x, y=y,
+        name=name, mode="lines+markers",
+        line=dict(color=color, width=width),
+        fill="tozeroy", fillcolor=fillcolor,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _pm25_bars(df_pm25: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Dates, PM2.5 values and per-bar colors for the PM2.5 chart:
+    green up to 35 µg/m³, orange up to 55, red above.
+    """
+    colors = pd.cut(
+        df_pm25["pm25_ugm3"],
+        bins=[-np.inf, 35, 55, np.inf],
+        labels=["#4caf50", "#ff9800", "#f44336"],
+    )
+    return (
+        df_pm25["date"].to_numpy(),
+        df_pm25["pm25_ugm3"].to_numpy(),
+        colors.astype(object).fillna("#4caf50").tolist(),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _fused_signals(df_env: pd.DataFrame, df_micro: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Fused daily timeseries plus its convergence summary, cached on the input frames."""
+    df_fused = fuse_signals(df_env, df_micro)
+    return df_fused, compute_signal_convergence(df_fused)
+
+
+@st.cache_data(show_spinner=False)
+def _actions_bundle(
+    alert_level: str,
+    drivers: List[Dict[str, Any]],
+    icu_strain: int,
+    kpi_data: Dict[str, Any],
+    sub_scores: Dict[str, Any],
+    df_vuln: pd.DataFrame,
+) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Top-5 vulnerable districts and the grouped action recommendations.
+    Takes only the KPI sections the recommender reads, so the per-run
+    last_update stamp does not invalidate the cache.
+    """
+    top_districts = top_vulnerable_districts(df_vuln)
+    all_actions = get_all_actions(
+        alert_level, drivers, top_districts, icu_strain,
+        {"kpis": kpi_data, "sub_scores": sub_scores},
+    )
+    return top_districts, all_actions
+
+
+@st.cache_data(show_spinner=False)
+def _icu_projection(df_fused: pd.DataFrame) -> np.ndarray:
+    """Projected ICU strain % per day of the fused window."""
+    from src.models.risk_kernel import project_icu
+
+    avg_vuln = 55  # approximate
+    return project_icu(
+        df_fused["temp_c"].to_numpy(),
+        df_fused["nighttime_temp_c"].to_numpy(),
+        df_fused["pm25_ugm3"].to_numpy(),
+        df_fused["symptom_search_index"].to_numpy(),
+        df_fused["pharmacy_visits_index"].to_numpy(),
+        df_fused["clinic_cases_index"].to_numpy(),
+        avg_vuln,
+    )
+
+
+def _get_actions(kpis: Dict[str, Any], df_vuln: pd.DataFrame):
+    """Resolve the action inputs from kpis and return (top_districts, all_actions)."""
+    kpi_data = kpis.get("kpis", {})
+    return _actions_bundle(
+        kpi_data.get("alert_level", {}).get("value", "WARNING"),
+        kpis.get("drivers", []),
+        kpi_data.get("icu_dual_load_risk", {}).get("icu_strain_pct", 15),
+        kpi_data,
+        kpis.get("sub_scores", {}),
+        df_vuln,
+    )
+
+
+@st.fragment
+def _map_block(geojson: Dict, df_vuln: pd.DataFrame):
+    """Map header, layer picker and map. A fragment, so switching layers reruns only the map."""
+    st.markdown(f'<div style="color:{COLORS["text_primary"]};font-size:16px;font-weight:600;margin-bottom:12px;padding-bottom:6px;border-bottom:2px solid {COLORS["accent_blue"]};display:inline-block;">🗺️ Elderly Vulnerability Map — Ankara</div>', unsafe_allow_html=True)
+
+    layer_mode = st.radio(
+        "Map Layer",
+        ["Vulnerability", "Heat Stress", "PM2.5", "Combined Risk"],
+        horizontal=True,
+        key="map_layer",
+        label_visibility="collapsed",
+    )
+    map_panel(geojson, df_vuln, layer_mode)
+
+
 def render_overview(kpis: Dict[str, Any], df_env: pd.DataFrame,
                     df_micro: pd.DataFrame, df_vuln: pd.DataFrame,
                     geojson: Dict):
     """Render the main Overview page."""
+    inject_css(["tabs", "map"])
 
     # Top bar
     render_top_bar(kpis)
 
-    kpi_data = kpis.get("kpis", {})
+    kv = KpiView.from_dict(kpis)
 
     # Alert Banner
-    alert = kpi_data.get("alert_level", {})
-    alert_banner(alert.get("value", "WATCH"), alert.get("reason", ""))
+    alert_banner(kv.alert_value, kv.alert_reason)
 
     # --- KPI Cards Row ---
     cols = st.columns(5)
 
     with cols[0]:
-        hr = kpi_data.get("heat_respiratory_risk_index", {})
         kpi_card(
             title="Heat-Respiratory Risk Index",
-            value=hr.get("value", 0),
-            level=hr.get("level", ""),
-            delta=f"↑ +{hr.get('delta_48h', 0)} / 48h",
-            bar_value=hr.get("value", 0),
+            value=kv.hr_value,
+            level=kv.hr_level,
+            delta=f"↑ +{kv.hr_delta} / 48h",
+            bar_value=kv.hr_value,
             scale_hint="Scale: 0–100 normalized composite index",
         )
 
     with cols[1]:
-        sp = kpi_data.get("respiratory_disease_surge_probability", {})
         kpi_card(
             title="Respiratory Disease Surge Probability",
-            value=sp.get("value_pct", 0),
+            value=kv.sp_value_pct,
             unit="%",
-            subtitle=sp.get("subtitle", ""),
-            delta=f"↑ +{sp.get('delta_48h', 0)} / 48h",
-            bar_value=sp.get("value_pct", 0),
+            subtitle=kv.sp_subtitle,
+            delta=f"↑ +{kv.sp_delta} / 48h",
+            bar_value=kv.sp_value_pct,
             scale_hint="Probability (%), model-calibrated (0–100)",
         )
 
     with cols[2]:
-        cs = kpi_data.get("combined_respiratory_stress_index", {})
-        conv_text = "Converging ⬆" if cs.get("convergence") else "Stable"
+        conv_text = "Converging ⬆" if kv.cs_convergence else "Stable"
         kpi_card(
             title="Combined Respiratory Stress Index",
-            value=cs.get("value", 0),
+            value=kv.cs_value,
             subtitle=conv_text,
-            bar_value=int(cs.get("value", 0) * 100),
+            bar_value=int(kv.cs_value * 100),
             scale_hint="Scale: 0.0–1.0 weighted fusion",
         )
 
     with cols[3]:
-        icu = kpi_data.get("icu_dual_load_risk", {})
         kpi_card(
             title="ICU Dual Load Risk",
-            value=icu.get("icu_strain_pct", 0),
+            value=kv.icu_strain_pct,
             unit="%",
-            subtitle=f"Peak: {icu.get('peak_date', 'N/A')}",
-            bar_value=int(icu.get("icu_strain_pct", 0) * 2.5),  # scale 0-40 to 0-100
+            subtitle=f"Peak: {kv.icu_peak_date}",
+            bar_value=int(kv.icu_strain_pct * 2.5),  # scale 0-40 to 0-100
             scale_hint="ICU strain %, projected (0–40)",
         )
 
     with cols[4]:
-        al = kpi_data.get("alert_level", {})
-        alert_val = al.get("value", "WATCH")
-        bar_val = {"NORMAL": 15, "WATCH": 40, "WARNING": 70, "EMERGENCY": 95}.get(alert_val, 15)
+        bar_val = _ALERT_BAR.get(kv.alert_value, 15)
         kpi_card(
             title="Alert Level",
-            value=alert_val,
-            subtitle=al.get("reason", ""),
+            value=kv.alert_value,
+            subtitle=kv.alert_reason,
             bar_value=bar_val,
         )
 
@@ -96,27 +265,11 @@ def render_overview(kpis: Dict[str, Any], df_env: pd.DataFrame,
     col_map, col_actions = st.columns([3, 2])
 
     with col_map:
-        st.markdown(f'<div style="color:{COLORS["text_primary"]};font-size:16px;font-weight:600;margin-bottom:12px;padding-bottom:6px;border-bottom:2px solid {COLORS["accent_blue"]};display:inline-block;">🗺️ Elderly Vulnerability Map — Ankara</div>', unsafe_allow_html=True)
-
-        layer_mode = st.radio(
-            "Map Layer",
-            ["Vulnerability", "Heat Stress", "PM2.5", "Combined Risk"],
-            horizontal=True,
-            key="map_layer",
-            label_visibility="collapsed",
-        )
-        map_panel(geojson, df_vuln, layer_mode)
+        _map_block(geojson, df_vuln)
 
     with col_actions:
         # Get actions
-        alert_level = kpi_data.get("alert_level", {}).get("value", "WARNING")
-        drivers_list = kpis.get("drivers", [])
-        top_districts = (
-            df_vuln.sort_values("vulnerability_score", ascending=False)["district_name"].tolist()[:5]
-        )
-        icu_strain = kpi_data.get("icu_dual_load_risk", {}).get("icu_strain_pct", 15)
-
-        all_actions = get_all_actions(alert_level, drivers_list, top_districts, icu_strain, kpis)
+        _, all_actions = _get_actions(kpis, df_vuln)
         actions_panel(all_actions, kpis)
 
     st.markdown("<br>", unsafe_allow_html=True)
@@ -136,6 +289,7 @@ def render_overview(kpis: Dict[str, Any], df_env: pd.DataFrame,
 
 def render_heat_air(kpis: Dict[str, Any], df_env: pd.DataFrame, df_vuln: pd.DataFrame, geojson: Dict):
     """Render Heat & Air Quality page."""
+    inject_css(["map"])
     render_top_bar(kpis)
 
     st.markdown("## 🌡️ Heat & Air Quality Analysis")
@@ -144,50 +298,58 @@ def render_heat_air(kpis: Dict[str, Any], df_env: pd.DataFrame, df_vuln: pd.Data
     col1, col2 = st.columns(2)
 
     with col1:
-        layout = get_plotly_layout("Temperature Trends")
-        fig = go.Figure(layout=layout)
-        fig.add_trace(go.Scatter(
-            x=df_env["date"], y=df_env["temp_c"],
-            name="Daytime Temp (°C)", mode="lines+markers",
-            line=dict(color="#ef5350", width=2.5),
-            fill="tozeroy", fillcolor="rgba(239,83,80,0.1)",
-        ))
-        fig.add_trace(go.Scatter(
-            x=df_env["date"], y=df_env["nighttime_temp_c"],
-            name="Nighttime Temp (°C)", mode="lines+markers",
-            line=dict(color="#ff8a65", width=2, dash="dash"),
-        ))
         # WHO threshold line
-        fig.add_hline(y=25, line_dash="dot", line_color="#ffa726",
-                      annotation_text="Nighttime Heat Threshold (25°C)")
-        fig.update_layout(height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        shape, note = _hline(25, "#ffa726", "Nighttime Heat Threshold (25°C)")
+        fig = {
+            "data": [
+                _area_trace(
+                    df_env["date"], df_env["temp_c"], "Daytime Temp (°C)",
+                    "#ef5350", "rgba(239,83,80,0.1)", width=2.5,
+                ),
+                dict(
+                    type="scattergl",
+                    x=df_env["date"], y=df_env["nighttime_temp_c"],
+                    name="Nighttime Temp (°C)", mode="lines+markers",
+                    line=dict(color="#ff8a65", width=2, dash="dash"),
+                ),
+            ],
+            "layout": {
+                **get_plotly_layout("Temperature Trends"),
+                "height": 350, "shapes": [shape], "annotations": [note],
+            },
+        }
+        plotly_chart(fig, key="heat_temp")
 
     with col2:
-        layout = get_plotly_layout("Air Quality — PM2.5")
-        fig = go.Figure(layout=layout)
-        fig.add_trace(go.Bar(
-            x=df_env["date"], y=df_env["pm25_ugm3"],
-            name="PM2.5 (µg/m³)",
-            marker_color=["#f44336" if v > 55 else "#ff9800" if v > 35 else "#4caf50"
-                          for v in df_env["pm25_ugm3"]],
-        ))
-        fig.add_hline(y=35, line_dash="dot", line_color="#ff9800",
-                      annotation_text="WHO 24h Guideline (35 µg/m³)")
-        fig.update_layout(height=350)
-        st.plotly_chart(fig, use_container_width=True)
+        dates, pm25, bar_colors = _pm25_bars(df_env[["date", "pm25_ugm3"]])
+        shape, note = _hline(35, "#ff9800", "WHO 24h Guideline (35 µg/m³)")
+        fig = {
+            "data": [
+                dict(
+                    type="bar",
+                    x=dates, y=pm25,
+                    name="PM2.5 (µg/m³)",
+                    marker=dict(color=bar_colors),
+                ),
+            ],
+            "layout": {
+                **get_plotly_layout("Air Quality — PM2.5"),
+                "height": 350, "shapes": [shape], "annotations": [note],
+            },
+        }
+        plotly_chart(fig, key="heat_pm25")
 
     # Humidity
-    layout = get_plotly_layout("Humidity Trend")
-    fig = go.Figure(layout=layout)
-    fig.add_trace(go.Scatter(
-        x=df_env["date"], y=df_env["humidity_pct"],
-        name="Humidity (%)", mode="lines+markers",
-        line=dict(color="#42a5f5", width=2),
-        fill="tozeroy", fillcolor="rgba(66,165,245,0.1)",
-    ))
-    fig.update_layout(height=250)
-    st.plotly_chart(fig, use_container_width=True)
+    fig = {
+        "data": [
+            _area_trace(
+                df_env["date"], df_env["humidity_pct"], "Humidity (%)",
+                "#42a5f5", "rgba(66,165,245,0.1)",
+            ),
+        ],
+        "layout": {**get_plotly_layout("Humidity Trend"), "height": 250},
+    }
+    plotly_chart(fig, key="heat_humidity")
 
     # District heatmap
     st.markdown("### 🗺️ Heat Stress by District")
@@ -197,41 +359,38 @@ def render_heat_air(kpis: Dict[str, Any], df_env: pd.DataFrame, df_vuln: pd.Data
 def render_respiratory_signals(kpis: Dict[str, Any], df_env: pd.DataFrame,
                                 df_micro: pd.DataFrame, df_vuln: pd.DataFrame):
     """Render Respiratory Signals page."""
+    inject_css(["alert"])
     render_top_bar(kpis)
 
     st.markdown("## 🫁 Respiratory Signals Analysis")
 
-    kpi_data = kpis.get("kpis", {})
-    sp = kpi_data.get("respiratory_disease_surge_probability", {})
+    kv = KpiView.from_dict(kpis)
 
     # KPI row
     col1, col2, col3 = st.columns(3)
     with col1:
         kpi_card(
-            "Surge Probability", f"{sp.get('value_pct', 0)}%", "",
-            f"↑ +{sp.get('delta_48h', 0)} / 48h",
-            bar_value=sp.get("value_pct", 0),
+            "Surge Probability", f"{kv.sp_value_pct}%", "",
+            f"↑ +{kv.sp_delta} / 48h",
+            bar_value=kv.sp_value_pct,
         )
     with col2:
-        cs = kpi_data.get("combined_respiratory_stress_index", {})
         kpi_card(
-            "Combined Stress Index", cs.get("value", 0), "",
-            "Converging" if cs.get("convergence") else "Stable",
-            bar_value=int(cs.get("value", 0) * 100),
+            "Combined Stress Index", kv.cs_value, "",
+            "Converging" if kv.cs_convergence else "Stable",
+            bar_value=int(kv.cs_value * 100),
         )
     with col3:
-        hr = kpi_data.get("heat_respiratory_risk_index", {})
         kpi_card(
-            "Heat-Respiratory Risk", hr.get("value", 0), "",
-            hr.get("level", ""),
-            bar_value=hr.get("value", 0),
+            "Heat-Respiratory Risk", kv.hr_value, "",
+            kv.hr_level,
+            bar_value=kv.hr_value,
         )
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Signal fusion
-    df_fused = fuse_signals(df_env, df_micro)
-    convergence = compute_signal_convergence(df_fused)
+    df_fused, convergence = _fused_signals(df_env, df_micro)
 
     col1, col2 = st.columns(2)
 
@@ -240,25 +399,30 @@ def render_respiratory_signals(kpis: Dict[str, Any], df_env: pd.DataFrame,
 
     with col2:
         # Fusion chart
-        layout = get_plotly_layout("Signal Fusion — Convergence Analysis")
-        fig = go.Figure(layout=layout)
-        fig.add_trace(go.Scatter(
-            x=df_fused["date"], y=df_fused["env_stress_index"],
-            name="Env Stress Index", mode="lines+markers",
-            line=dict(color="#ef5350", width=2),
-        ))
-        fig.add_trace(go.Scatter(
-            x=df_fused["date"], y=df_fused["pop_signal_index"],
-            name="Pop Signal Index", mode="lines+markers",
-            line=dict(color="#26c6da", width=2),
-        ))
-        fig.add_trace(go.Scatter(
-            x=df_fused["date"], y=df_fused["fusion_score"],
-            name="Fusion Score", mode="lines+markers",
-            line=dict(color="#ffa726", width=2.5, dash="dash"),
-        ))
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
+        fig = {
+            "data": [
+                dict(
+                    type="scattergl",
+                    x=df_fused["date"], y=df_fused["env_stress_index"],
+                    name="Env Stress Index", mode="lines+markers",
+                    line=dict(color="#ef5350", width=2),
+                ),
+                dict(
+                    type="scattergl",
+                    x=df_fused["date"], y=df_fused["pop_signal_index"],
+                    name="Pop Signal Index", mode="lines+markers",
+                    line=dict(color="#26c6da", width=2),
+                ),
+                dict(
+                    type="scattergl",
+                    x=df_fused["date"], y=df_fused["fusion_score"],
+                    name="Fusion Score", mode="lines+markers",
+                    line=dict(color="#ffa726", width=2.5, dash="dash"),
+                ),
+            ],
+            "layout": {**get_plotly_layout("Signal Fusion — Convergence Analysis"), "height": 300},
+        }
+        plotly_chart(fig, key="fusion")
 
     # Convergence status
     st.info(
@@ -273,209 +437,180 @@ def render_respiratory_signals(kpis: Dict[str, Any], df_env: pd.DataFrame,
 def render_icu_capacity(kpis: Dict[str, Any], df_env: pd.DataFrame,
                         df_micro: pd.DataFrame):
     """Render ICU / Capacity page."""
+    inject_css()
     render_top_bar(kpis)
 
     st.markdown("## 🏥 ICU & Capacity Projection")
 
-    kpi_data = kpis.get("kpis", {})
-    icu = kpi_data.get("icu_dual_load_risk", {})
+    kv = KpiView.from_dict(kpis)
 
     col1, col2, col3 = st.columns(3)
     with col1:
         kpi_card(
-            "ICU Strain", f"{icu.get('icu_strain_pct', 0)}%", "",
-            f"Peak: {icu.get('peak_date', 'N/A')}",
-            bar_value=int(icu.get("icu_strain_pct", 0) * 2.5),
+            "ICU Strain", f"{kv.icu_strain_pct}%", "",
+            f"Peak: {kv.icu_peak_date}",
+            bar_value=int(kv.icu_strain_pct * 2.5),
         )
     with col2:
-        hr = kpi_data.get("heat_respiratory_risk_index", {})
         kpi_card(
-            "Heat-Resp Risk Driver", hr.get("value", 0), "",
-            hr.get("level", ""), bar_value=hr.get("value", 0),
+            "Heat-Resp Risk Driver", kv.hr_value, "",
+            kv.hr_level, bar_value=kv.hr_value,
         )
     with col3:
-        sp = kpi_data.get("respiratory_disease_surge_probability", {})
         kpi_card(
-            "Surge Driver", f"{sp.get('value_pct', 0)}%", "",
-            "", bar_value=sp.get("value_pct", 0),
+            "Surge Driver", f"{kv.sp_value_pct}%", "",
+            "", bar_value=kv.sp_value_pct,
         )
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Projected ICU load over time
-    df_fused = fuse_signals(df_env, df_micro)
+    df_fused, _ = _fused_signals(df_env, df_micro)
 
     # Simulate ICU projection per day
-    from src.models.risk_engine import compute_icu_strain, compute_heat_respiratory_risk_index, compute_heat_score, compute_pollution_score, compute_micro_signal_score, compute_respiratory_surge_probability
-    import numpy as np
-
-    icu_projection = []
-    for _, row in df_fused.iterrows():
-        hs = compute_heat_score(row["temp_c"], row["nighttime_temp_c"])
-        ps = compute_pollution_score(row["pm25_ugm3"])
-        ms = compute_micro_signal_score(
-            row["symptom_search_index"],
-            row["pharmacy_visits_index"],
-            row["clinic_cases_index"],
-        )
-        avg_vuln = 55  # approximate
-        hrr = compute_heat_respiratory_risk_index(hs, ps, avg_vuln, ms)
-        sp = compute_respiratory_surge_probability(ms, row["pm25_ugm3"], row["nighttime_temp_c"])
-        strain = compute_icu_strain(hrr, sp)
-        icu_projection.append(strain)
+    icu_projection = _icu_projection(df_fused)
 
     layout = get_plotly_layout("Projected ICU Strain Over Forecast Period")
-    fig = go.Figure(layout=layout)
-    fig.add_trace(go.Scatter(
-        x=df_fused["date"], y=icu_projection,
-        name="ICU Strain (%)", mode="lines+markers",
-        line=dict(color="#ef5350", width=2.5),
-        fill="tozeroy", fillcolor="rgba(239,83,80,0.15)",
-    ))
-    fig.add_hline(y=30, line_dash="dot", line_color="#d50000",
-                  annotation_text="Emergency Threshold (30%)")
-    fig.add_hline(y=20, line_dash="dot", line_color="#ff9800",
-                  annotation_text="Warning Threshold (20%)")
-    fig.update_layout(height=350, yaxis=dict(range=[0, 45]))
-    st.plotly_chart(fig, use_container_width=True)
+    emergency_shape, emergency_note = _hline(30, "#d50000", "Emergency Threshold (30%)")
+    warning_shape, warning_note = _hline(20, "#ff9800", "Warning Threshold (20%)")
+    fig = {
+        "data": [
+            _area_trace(
+                *lttb(df_fused["date"].to_numpy(), icu_projection), "ICU Strain (%)",
+                "#ef5350", "rgba(239,83,80,0.15)", width=2.5,
+            ),
+        ],
+        "layout": {
+            **layout,
+            "height": 350,
+            "yaxis": {**layout["yaxis"], "range": [0, 45]},
+            "shapes": [emergency_shape, warning_shape],
+            "annotations": [emergency_note, warning_note],
+        },
+    }
+    plotly_chart(fig, key="icu_proj")
 
     # Capacity table
     st.markdown(f'<div style="color:{COLORS["text_primary"]};font-size:16px;font-weight:600;margin-bottom:12px;padding-bottom:6px;border-bottom:2px solid {COLORS["accent_blue"]};display:inline-block;">📊 Capacity Indicators</div>', unsafe_allow_html=True)
 
-    cap_data = [
-        ("ICU Beds (est.)", f"{icu.get('icu_strain_pct', 15)}%", f"{min(40, icu.get('icu_strain_pct', 15) + 10)}%", "⚠️ Watch", COLORS["risk_med"]),
-        ("Respiratory Ventilators", "18%", "28%", "✅ Normal", COLORS["risk_low"]),
-        ("Oxygen Supply", "65%", "75%", "⚠️ Watch", COLORS["risk_med"]),
-        ("ER Triage Capacity", "45%", "60%", "✅ Normal", COLORS["risk_low"]),
-    ]
+    st.markdown(_capacity_table_html(kv.icu_strain_pct), unsafe_allow_html=True)
 
-    th_style = f'padding:10px 14px;text-align:left;color:{COLORS["text_muted"]};font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:1px;border-bottom:2px solid {COLORS["border"]};'
-    rows_html = ""
-    for name, current, peak, status, color in cap_data:
-        rows_html += (
-            f'<tr style="border-bottom:1px solid {COLORS["border"]};">'
-            f'<td style="padding:12px 14px;color:{COLORS["text_primary"]};font-weight:500;">{name}</td>'
-            f'<td style="padding:12px 14px;color:{COLORS["text_secondary"]};">{current}</td>'
-            f'<td style="padding:12px 14px;color:{COLORS["text_secondary"]};">{peak}</td>'
-            f'<td style="padding:12px 14px;color:{color};font-weight:600;">{status}</td>'
-            f'</tr>'
-        )
 
-    table_html = (
-        f'<div style="background:{COLORS["bg_card"]};border:1px solid {COLORS["border"]};border-radius:12px;overflow:hidden;margin-bottom:16px;">'
-        f'<table style="width:100%;border-collapse:collapse;">'
-        f'<thead><tr style="background:{COLORS["bg_sidebar"]};">'
-        f'<th style="{th_style}">Indicator</th>'
-        f'<th style="{th_style}">Current Load</th>'
-        f'<th style="{th_style}">Projected Peak</th>'
-        f'<th style="{th_style}">Status</th>'
-        f'</tr></thead>'
-        f'<tbody>{rows_html}</tbody></table></div>'
+# ── Dispatch center callbacks ─────────────────────────────────
+def _do_send_sms():
+    st.session_state["sms_sent"] = True
+
+
+def _do_reset_sms():
+    st.session_state["sms_sent"] = False
+
+
+def _do_send_briefing():
+    st.session_state["briefing_sent"] = True
+
+
+def _do_reset_briefing():
+    st.session_state["briefing_sent"] = False
+
+
+# The SMS and briefing panels are separate fragments, so their widgets only
+# rerun their own panel instead of the whole page.
+@st.fragment
+def _sms_panel(alert_level: str, kpis: Dict[str, Any]):
+    """SMS alert preview and dispatch."""
+    from src.actions.playbooks import generate_sms_alert
+
+    st.markdown("**📱 SMS Alert**")
+
+    template_target = st.radio(
+        "Target Audience",
+        ["🏙️ Public (General)", "👴 65+ Elderly"],
+        key="sms_template_target",
+        horizontal=True,
     )
-    st.markdown(table_html, unsafe_allow_html=True)
+    target_key = "elderly" if "Elderly" in template_target else "public"
+    sms_text = generate_sms_alert(alert_level, kpis, target=target_key)
+
+    st.text_area(
+        "Message Preview",
+        value=sms_text,
+        height=180,
+        key="sms_preview_ta",
+        label_visibility="collapsed",
+    )
+
+    recipients = {"🏙️ Public (General)": "142,600", "👴 65+ Elderly": "18,450"}
+    rec_count = recipients.get(template_target, "—")
+    st.caption(f"Recipients: **{rec_count} subscribers**")
+
+    if st.session_state.get("sms_sent", False):
+        st.success("✅ SMS alert dispatched successfully!")
+        st.button("↺ Reset", key="sms_reset_btn", on_click=_do_reset_sms)
+    else:
+        st.button(
+            "🚀 Send SMS Alert Now",
+            key="send_sms_now",
+            use_container_width=True,
+            type="primary",
+            on_click=_do_send_sms,
+        )
+
+
+@st.fragment
+def _briefing_panel(kpis: Dict[str, Any], top_districts: List[str],
+                    all_actions: Dict[str, List[Dict[str, Any]]]):
+    """Briefing note preview and dispatch."""
+    from src.actions.playbooks import generate_briefing_note
+
+    st.markdown("**📋 Briefing Note**")
+
+    note = generate_briefing_note(kpis, top_districts, all_actions)
+    with st.expander("📄 View Briefing Note", expanded=st.session_state.get("briefing_open", False)):
+        st.text_area(
+            "Briefing Note Content",
+            value=note,
+            height=200,
+            key="briefing_ta",
+            label_visibility="collapsed",
+        )
+
+    st.caption("Send to: **Municipal Health Authority**")
+
+    if st.session_state.get("briefing_sent", False):
+        st.success("✅ Briefing Note sent successfully!")
+        st.button("↺ Reset", key="brief_reset_btn", on_click=_do_reset_briefing)
+    else:
+        st.button(
+            "📤 Send Briefing Note",
+            key="send_briefing_now",
+            use_container_width=True,
+            on_click=_do_send_briefing,
+        )
 
 
 def render_actions_playbooks(kpis: Dict[str, Any], df_vuln: pd.DataFrame):
     """Render Actions & Playbooks page."""
+    inject_css(["tabs", "expander", "alert"])
     render_top_bar(kpis)
 
     st.markdown("## 📋 Actions & Playbooks")
 
     kpi_data = kpis.get("kpis", {})
     alert_level = kpi_data.get("alert_level", {}).get("value", "WARNING")
-    drivers_list = kpis.get("drivers", [])
-    top_districts = (
-        df_vuln.sort_values("vulnerability_score", ascending=False)["district_name"].tolist()[:5]
-    )
-    icu_strain = kpi_data.get("icu_dual_load_risk", {}).get("icu_strain_pct", 15)
-
-    all_actions = get_all_actions(alert_level, drivers_list, top_districts, icu_strain, kpis)
+    top_districts, all_actions = _get_actions(kpis, df_vuln)
     actions_panel(all_actions, kpis)
 
     st.markdown("---")
     st.markdown("### 📱 Dispatch Center")
     st.caption("Send alerts and briefing notes to relevant stakeholders.")
 
-    from src.actions.playbooks import generate_sms_alert, generate_briefing_note
-
-    # ── Callback functions for buttons ────────────────────────
-    def _do_send_sms():
-        st.session_state["sms_sent"] = True
-
-    def _do_reset_sms():
-        st.session_state["sms_sent"] = False
-
-    def _do_send_briefing():
-        st.session_state["briefing_sent"] = True
-
-    def _do_reset_briefing():
-        st.session_state["briefing_sent"] = False
-
     sms_col, brief_col = st.columns(2)
 
-    # ── SMS DISPATCH ──────────────────────────────────────────
     with sms_col:
-        st.markdown("**📱 SMS Alert**")
-
-        template_target = st.radio(
-            "Target Audience",
-            ["🏙️ Public (General)", "👴 65+ Elderly"],
-            key="sms_template_target",
-            horizontal=True,
-        )
-        target_key = "elderly" if "Elderly" in template_target else "public"
-        sms_text = generate_sms_alert(alert_level, kpis, target=target_key)
-
-        st.text_area(
-            "Message Preview",
-            value=sms_text,
-            height=180,
-            key="sms_preview_ta",
-            label_visibility="collapsed",
-        )
+        _sms_panel(alert_level, kpis)
 
-        recipients = {"🏙️ Public (General)": "142,600", "👴 65+ Elderly": "18,450"}
-        rec_count = recipients.get(template_target, "—")
-        st.caption(f"Recipients: **{rec_count} subscribers**")
-
-        if st.session_state.get("sms_sent", False):
-            st.success("✅ SMS alert dispatched successfully!")
-            st.button("↺ Reset", key="sms_reset_btn", on_click=_do_reset_sms)
-        else:
-            st.button(
-                "🚀 Send SMS Alert Now",
-                key="send_sms_now",
-                use_container_width=True,
-                type="primary",
-                on_click=_do_send_sms,
-            )
-
-    # ── BRIEFING NOTE ─────────────────────────────────────────
     with brief_col:
-        st.markdown("**📋 Briefing Note**")
-
-        note = generate_briefing_note(kpis, top_districts, all_actions)
-        with st.expander("📄 View Briefing Note", expanded=st.session_state.get("briefing_open", False)):
-            st.text_area(
-                "Briefing Note Content",
-                value=note,
-                height=200,
-                key="briefing_ta",
-                label_visibility="collapsed",
-            )
-
-        st.caption("Send to: **Municipal Health Authority**")
-
-        if st.session_state.get("briefing_sent", False):
-            st.success("✅ Briefing Note sent successfully!")
-            st.button("↺ Reset", key="brief_reset_btn", on_click=_do_reset_briefing)
-        else:
-            st.button(
-                "📤 Send Briefing Note",
-                key="send_briefing_now",
-                use_container_width=True,
-                on_click=_do_send_briefing,
-            )
+        _briefing_panel(kpis, top_districts, all_actions)
 
     # Reset open flags after first render
     st.session_state.pop("sms_open", None)
@@ -485,6 +620,7 @@ def render_actions_playbooks(kpis: Dict[str, Any], df_vuln: pd.DataFrame):
 
 def render_data_ethics(kpis: Dict[str, Any]):
     """Render Data & Ethics page."""
+    inject_css(["alert"])
     render_top_bar(kpis)
 
     st.markdown("## 🔒 Data & Ethics")
@@ -528,6 +664,7 @@ def render_data_ethics(kpis: Dict[str, Any]):
 
 def render_settings(kpis: Dict[str, Any]):
     """Render Settings page."""
+    inject_css(["alert"])
     render_top_bar(kpis)
 
     st.markdown("## ⚙️ Settings")
@@ -3,8 +3,28 @@ Theme and custom CSS for HEATWATCH+ Demo.
 Dark navy/blue professional theme matching the reference design.
 """
 
+import base64
+import copy
+import hashlib
+import re
+import string
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+import streamlit as st
+
+
+def _frozen(d: dict) -> Mapping:
+    """Read-only view of d with interned string values; nested dicts are frozen too."""
+    return MappingProxyType({
+        k: _frozen(v) if isinstance(v, dict) else sys.intern(v) for k, v in d.items()
+    })
+
+
 # Color palette
-COLORS = {
+COLORS = _frozen({
     "bg_dark": "#0f1629",
     "bg_card": "#182040",
     "bg_card_hover": "#1e2850",
@@ -27,388 +47,500 @@ COLORS = {
     "gradient_yellow": "#fdd835",
     "gradient_orange": "#fb8c00",
     "gradient_red": "#e53935",
-}
+})
 
 # Alert level colors
-ALERT_COLORS = {
+ALERT_COLORS = _frozen({
     "NORMAL": {"bg": "#4caf5015", "border": "#4caf50", "text": "#66bb6a"},
     "WATCH": {"bg": "#ff980015", "border": "#ff9800", "text": "#ffa726"},
     "WARNING": {"bg": "#ff572215", "border": "#ff5722", "text": "#ff7043"},
     "EMERGENCY": {"bg": "#d5000015", "border": "#d50000", "text": "#ef5350"},
-}
+})
 
 # Risk level colors
-LEVEL_COLORS = {
+LEVEL_COLORS = _frozen({
     "High": "#f44336",
     "Med": "#ff9800",
     "Low": "#4caf50",
+})
+
+
+def _minify(css: str) -> str:
+    """Strip comments and collapse whitespace — run once at import, never per rerun."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([;{},>])\s*", r"\1", css)
+    # Only after ":" — a space before it is a descendant combinator (e.g. "div :is(...)")
+    css = re.sub(r":\s+", ":", css)
+    # "!important" stays: Streamlit's own styles are unlayered, and unlayered
+    # rules beat any @layer, so only the space in front of it can go
+    css = css.replace(" !important", "!important")
+    return css.strip()
+
+
+@lru_cache(maxsize=None)
+def _a(hex6: str, alpha_pct: int) -> str:
+    """#rrggbb at alpha_pct% opacity -> 8-digit #rrggbbaa."""
+    return f"{hex6}{alpha_pct * 255 // 100:02x}"
+
+
+# accent_blue tints used by the stylesheet, keyed by opacity %
+ACCENT_BLUE_ALPHA = {pct: _a(COLORS["accent_blue"], pct) for pct in (13, 15, 19, 25, 31, 38)}
+
+# Every palette entry as a CSS custom property: accent_blue -> --accent-blue.
+# Each tint gets its own property: accent_blue at 15% -> --accent-blue-a15.
+_PALETTE = {**COLORS, **{f"accent_blue_a{pct}": v for pct, v in ACCENT_BLUE_ALPHA.items()}}
+
+# Parsed once; re-theming is a single substitute() over another palette
+_ROOT_TPL = string.Template(
+    ":root {" + "".join(f"--{k.replace('_', '-')}: ${{{k}}};" for k in _PALETTE) + "}"
+)
+_ROOT_VARS = _ROOT_TPL.substitute(_PALETTE)
+
+# Stylesheet fragments, one per component. The rules only reference var(--...),
+# so each body is plain static text.
+CSS_GLOBAL = """
+    /* ===== GLOBAL ===== */
+    .stApp {
+        background-color: var(--bg-dark);
+        color: var(--text-primary);
+    }
+
+    /* ===== HEADERS ===== */
+    h1, h2, h3, h4 {
+        color: var(--text-primary) !important;
+    }
+
+    /* ===== DIVIDERS ===== */
+    hr {
+        border-color: var(--border) !important;
+    }
+
+    /* ===== HIDE DEFAULT ELEMENTS ===== */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+"""
+CSS_SIDEBAR = """
+    /* ===== SIDEBAR ===== */
+    section[data-testid="stSidebar"] {
+        background: linear-gradient(180deg, var(--bg-sidebar) 0%, #080c20 100%);
+        border-right: 1px solid var(--border);
+    }
+    section[data-testid="stSidebar"] .stMarkdown {
+        color: var(--text-primary);
+    }
+
+    /* Sidebar toggle button — keep visible and styled */
+    button[data-testid="stSidebarCollapseButton"],
+    button[data-testid="stSidebarNavCollapseButton"],
+    button[kind="header"] {
+        color: var(--text-secondary) !important;
+        background: transparent !important;
+    }
+
+    /* ===== RADIO BUTTONS (Navigation) ===== */
+    div[data-testid="stRadio"] > div[role="radiogroup"] {
+        gap: 6px !important;
+    }
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label {
+        background: transparent !important;
+        /* 3px extra left padding stands in for the old border-left accent */
+        padding: 12px 16px 12px 19px !important;
+        border-radius: 8px !important;
+        transition: background-color 0.2s ease, box-shadow 0.2s ease !important;
+        cursor: pointer !important;
+        box-shadow: inset 3px 0 0 transparent !important;
+    }
+    /* Hide the default radio circle */
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:first-child {
+        display: none !important;
+    }
+    /* Structure the inner text div to align icons and text properly */
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:last-child {
+        display: flex !important;
+        flex-direction: row !important;
+        align-items: center !important;
+    }
+    /* Style the actual text */
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:last-child > div > p {
+        font-size: 16px !important;
+        font-weight: 600 !important;
+        color: #ffffff !important; /* Pure white for maximum readability */
+        display: flex !important;
+        align-items: center !important;
+        margin: 0 !important;
+        white-space: pre-wrap !important;
+    }
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label:hover {
+        background: var(--bg-card-hover) !important;
+    }
+    /* Selected State */
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label:has(input:checked) {
+        background: var(--accent-blue-a15) !important;
+        box-shadow: inset 3px 0 0 var(--accent-blue) !important;
+    }
+    div[data-testid="stRadio"] > div[role="radiogroup"] > label:has(input:checked) > div:last-child > div > p {
+        color: var(--accent-cyan) !important;
+        font-weight: 700 !important;
+    }
+"""
+CSS_BUTTONS = """
+    /* ===== BUTTONS ===== */
+    .stButton > button {
+        /* Flat fill at the old gradient's midpoint; the gradient is kept for :hover */
+        background: var(--accent-blue-a13) !important;
+        color: var(--text-primary) !important;
+        border: 1px solid var(--accent-blue-a31) !important;
+        border-radius: 8px !important;
+        padding: 8px 20px !important;
+        font-weight: 600 !important;
+        font-size: 13px !important;
+        transition: background-color 0.2s ease, color 0.2s ease, border-color 0.2s ease,
+                    box-shadow 0.2s ease, transform 0.2s ease !important;
+    }
+    .stButton > button:hover {
+        background: linear-gradient(135deg, var(--accent-blue-a31), var(--accent-blue-a19)) !important;
+        border-color: var(--accent-blue) !important;
+        box-shadow: 0 4px 12px var(--accent-blue-a19) !important;
+        transform: translateY(-1px) !important;
+    }
+    .stButton > button:active {
+        transform: translateY(0) !important;
+    }
+"""
+CSS_INPUTS = """
+    /* ===== SELECT / INPUT WIDGETS ===== */
+    div[data-baseweb="select"] {
+        background-color: var(--bg-card) !important;
+        border-radius: 8px !important;
+    }
+    div[data-baseweb="select"] > div {
+        background-color: var(--bg-card) !important;
+        border: 1px solid var(--border) !important;
+        border-radius: 8px !important;
+        color: #ffffff !important;
+        font-size: 14px !important;
+    }
+    /* Dropdown popover container (aggressive to fix white background) */
+    div[data-baseweb="popover"],
+    div[data-baseweb="popover"] > div,
+    div[data-baseweb="popover"] ul,
+    ul[role="listbox"],
+    div[role="listbox"],
+    ul[data-testid="stSelectboxVirtualDropdown"] {
+        background-color: var(--bg-card) !important;
+        border-color: var(--border) !important;
+    }
+    /* Dropdown items (options) */
+    :is(ul[role="listbox"] li, ul[data-testid="stSelectboxVirtualDropdown"] li, div[role="option"]) {
+        color: #ffffff !important;
+        font-size: 14px !important;
+        padding: 10px 16px !important;
+        background-color: var(--bg-card) !important; 
+    }
+    :is(ul[role="listbox"] li, ul[data-testid="stSelectboxVirtualDropdown"] li, div[role="option"]):hover {
+        background-color: var(--accent-blue-a25) !important;
+        color: #ffffff !important;
+    }
+
+    /* Multi-select tags */
+    span[data-baseweb="tag"] {
+        background: var(--accent-blue-a15) !important;
+        color: var(--accent-blue) !important;
+        border: 1px solid var(--accent-blue-a25) !important;
+        border-radius: 6px !important;
+    }
+
+    /* Date input */
+    input[type="text"],
+    input[type="number"],
+    div[data-baseweb="input"] > div {
+        background-color: var(--bg-card) !important;
+        color: var(--text-primary) !important;
+        border: 1px solid var(--border) !important;
+        border-radius: 6px !important;
+    }
+
+    /* ===== SLIDER ===== */
+    .stSlider > div > div > div {
+        color: var(--text-primary) !important;
+    }
+
+    /* ===== LABELS ===== */
+    .stSelectbox label, .stMultiSelect label, .stSlider label, .stNumberInput label, .stDateInput label {
+        color: var(--text-muted) !important;
+        font-size: 12px !important;
+        font-weight: 600 !important;
+    }
+"""
+# Shared selector lists, joined into merged rules below
+_CALENDAR = 'div[data-baseweb="calendar"]'
+_CALENDAR_SURFACES = (
+    _CALENDAR,
+    'div[data-baseweb="datepicker"]',
+    f"{_CALENDAR} > div",
+    f"{_CALENDAR} > div > div",
+    f'{_CALENDAR} :is([role="grid"], [role="row"], [role="gridcell"])',
+    f"{_CALENDAR} button",
+)
+
+CSS_CALENDAR = f"""
+    /* ===== DATE PICKER CALENDAR - FULL DARK OVERRIDE ===== */
+    {", ".join(_CALENDAR_SURFACES)} {{
+        background-color: var(--bg-card) !important;
+        color: #ffffff !important;
+    }}
+    /* Selected day, month/year header text */
+    {_CALENDAR} :is([aria-selected="true"], [data-baseweb="typo-label-medium"], [data-baseweb="typo-paragraph-medium"], span) {{
+        color: #ffffff !important;
+    }}
+    /* Day cells */
+    {_CALENDAR} button {{
+        border: none !important;
+    }}
+    {_CALENDAR} button:hover {{
+        background-color: var(--accent-blue-a38) !important;
+    }}
+    /* Selected day */
+    {_CALENDAR} [aria-selected="true"] {{
+        background-color: var(--accent-blue) !important;
+    }}
+    /* Day-of-week labels (Mon, Tue, etc.) */
+    {_CALENDAR} [role="columnheader"] {{
+        color: var(--text-muted) !important;
+    }}
+    /* Popover wrapper */
+    div[data-baseweb="popover"] > div {{
+        background-color: var(--bg-card) !important;
+        border: 1px solid var(--border) !important;
+        border-radius: 10px !important;
+    }}
+"""
+CSS_TABS = """
+    /* ===== TABS ===== */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 0px;
+        background-color: var(--bg-card);
+        border-radius: 8px;
+        padding: 4px;
+        border: 1px solid var(--border);
+    }
+    .stTabs [data-baseweb="tab"] {
+        color: var(--text-secondary);
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-weight: 500;
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: var(--accent-blue-a15) !important;
+        color: var(--accent-blue) !important;
+        font-weight: 600;
+    }
+"""
+CSS_EXPANDER = """
+    /* ===== EXPANDER (SMS/Briefing) ===== */
+    .streamlit-expanderHeader {
+        background-color: var(--bg-card) !important;
+        border-radius: 8px !important;
+        color: var(--text-primary) !important;
+    }
+    details[data-testid="stExpander"] {
+        background-color: var(--bg-card) !important;
+        border: 1px solid var(--border) !important;
+        border-radius: 10px !important;
+        /* Skip offscreen rendering; "auto" keeps the last measured size */
+        content-visibility: auto;
+        contain-intrinsic-size: auto 200px;
+    }
+    details[data-testid="stExpander"] summary {
+        color: var(--text-primary) !important;
+    }
+    details[data-testid="stExpander"] > div {
+        background-color: var(--bg-card) !important;
+    }
+"""
+_CODE_SURFACES = (".stCodeBlock", '[data-testid="stCodeBlock"]', '[data-testid="stCodeBlock"] > div')
+_CODE_TEXT = ("pre", "code", ".stCodeBlock pre", '[data-testid="stCodeBlock"] pre', '[data-testid="stCodeBlock"] code')
+
+CSS_CODE_BLOCK = f"""
+    /* ===== CODE BLOCKS (SMS templates etc.) ===== */
+    {", ".join(_CODE_SURFACES + _CODE_TEXT)} {{
+        background-color: var(--bg-dark) !important;
+    }}
+    {", ".join(_CODE_TEXT)} {{
+        color: var(--text-primary) !important;
+    }}
+    pre, code {{
+        border: 1px solid var(--border) !important;
+        border-radius: 8px !important;
+    }}
+    [data-testid="stCodeBlock"] {{
+        content-visibility: auto;
+        contain-intrinsic-size: auto 200px;
+    }}
+    .stCodeBlock pre {{
+        font-family: 'Consolas', 'Monaco', monospace !important;
+        font-size: 13px !important;
+        line-height: 1.6 !important;
+    }}
+"""
+CSS_DATAFRAME = """
+    /* ===== DATAFRAME ===== */
+    .stDataFrame {
+        border: 1px solid var(--border) !important;
+        border-radius: 8px !important;
+    }
+"""
+CSS_METRIC = """
+    /* ===== METRIC CARDS ===== */
+    [data-testid="stMetric"] {
+        background-color: var(--bg-card);
+        border: 1px solid var(--border);
+        border-radius: 10px;
+        padding: 16px;
+    }
+"""
+CSS_ALERT = """
+    /* ===== INFO/WARNING/ERROR BOXES ===== */
+    .stAlert {
+        background-color: var(--bg-card) !important;
+        border-radius: 8px !important;
+        color: var(--text-primary) !important;
+    }
+"""
+CSS_MAP = """
+    /* ===== FOLIUM MAP CONTAINER ===== */
+    iframe {
+        border-radius: 12px !important;
+        border: 1px solid var(--border) !important;
+    }
+"""
+CSS_SCROLLBAR = """
+    /* ===== SCROLLBAR ===== */
+    ::-webkit-scrollbar {
+        width: 8px;
+        height: 8px;
+    }
+    ::-webkit-scrollbar-track {
+        background: var(--bg-dark);
+    }
+    ::-webkit-scrollbar-thumb {
+        background: var(--border);
+        border-radius: 4px;
+    }
+    ::-webkit-scrollbar-thumb:hover {
+        background: var(--accent-blue-a38);
+    }
+"""
+
+# Minified once at import, in cascade order — later fragments override
+# earlier ones, so keep this order when emitting a subset.
+_CSS_BODIES = {
+    "global": _minify(_ROOT_VARS + CSS_GLOBAL),
+    "sidebar": _minify(CSS_SIDEBAR),
+    "buttons": _minify(CSS_BUTTONS),
+    "inputs": _minify(CSS_INPUTS),
+    "calendar": _minify(CSS_CALENDAR),
+    "tabs": _minify(CSS_TABS),
+    "expander": _minify(CSS_EXPANDER),
+    "code_block": _minify(CSS_CODE_BLOCK),
+    "dataframe": _minify(CSS_DATAFRAME),
+    "metric": _minify(CSS_METRIC),
+    "alert": _minify(CSS_ALERT),
+    "map": _minify(CSS_MAP),
+    "scrollbar": _minify(CSS_SCROLLBAR),
 }
+CSS_FRAGMENTS = {
+    scope: f'<style data-scope="{scope}">{body}</style>' for scope, body in _CSS_BODIES.items()
+}
+# CSP source expressions for each <style> element's text, e.g. for a
+# style-src 'sha256-...' header — hashed once per process
+CSS_SHA256 = {
+    scope: "sha256-" + base64.b64encode(hashlib.sha256(body.encode()).digest()).decode()
+    for scope, body in _CSS_BODIES.items()
+}
+
+# Present on every page: the sidebar alone renders radio, buttons, date inputs and selects
+BASE_SCOPES = ("global", "sidebar", "buttons", "inputs", "calendar", "scrollbar")
+
+_CACHED_CSS = "".join(CSS_FRAGMENTS.values())
 
 
 def get_custom_css() -> str:
-    """Return custom CSS for the entire Streamlit app."""
-    return f"""
-    <style>
-        /* ===== GLOBAL ===== */
-        .stApp {{
-            background-color: {COLORS['bg_dark']};
-            color: {COLORS['text_primary']};
-        }}
-
-        /* ===== SIDEBAR ===== */
-        section[data-testid="stSidebar"] {{
-            background: linear-gradient(180deg, {COLORS['bg_sidebar']} 0%, #080c20 100%);
-            border-right: 1px solid {COLORS['border']};
-        }}
-        section[data-testid="stSidebar"] .stMarkdown {{
-            color: {COLORS['text_primary']};
-        }}
-
-        /* Sidebar toggle button — keep visible and styled */
-        button[data-testid="stSidebarCollapseButton"],
-        button[data-testid="stSidebarNavCollapseButton"],
-        button[kind="header"] {{
-            color: {COLORS['text_secondary']} !important;
-            background: transparent !important;
-        }}
-
-        /* ===== HEADERS ===== */
-        h1, h2, h3, h4 {{
-            color: {COLORS['text_primary']} !important;
-        }}
-
-        /* ===== RADIO BUTTONS (Navigation) ===== */
-        div[data-testid="stRadio"] > div[role="radiogroup"] {{
-            gap: 6px !important;
-        }}
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label {{
-            background: transparent !important;
-            padding: 12px 16px !important;
-            border-radius: 8px !important;
-            transition: all 0.2s ease !important;
-            cursor: pointer !important;
-            border-left: 3px solid transparent !important;
-        }}
-        /* Hide the default radio circle */
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:first-child {{
-            display: none !important;
-        }}
-        /* Structure the inner text div to align icons and text properly */
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:last-child {{
-            display: flex !important;
-            flex-direction: row !important;
-            align-items: center !important;
-        }}
-        /* Style the actual text */
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label > div:last-child > div > p {{
-            font-size: 16px !important;
-            font-weight: 600 !important;
-            color: #ffffff !important; /* Pure white for maximum readability */
-            display: flex !important;
-            align-items: center !important;
-            margin: 0 !important;
-            white-space: pre-wrap !important;
-        }}
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label:hover {{
-            background: {COLORS['bg_card_hover']} !important;
-        }}
-        /* Selected State */
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label:has(input:checked) {{
-            background: {COLORS['accent_blue']}25 !important;
-            border-left: 3px solid {COLORS['accent_blue']} !important;
-        }}
-        div[data-testid="stRadio"] > div[role="radiogroup"] > label:has(input:checked) > div:last-child > div > p {{
-            color: {COLORS['accent_cyan']} !important;
-            font-weight: 700 !important;
-        }}
-
-        /* ===== BUTTONS ===== */
-        .stButton > button {{
-            background: linear-gradient(135deg, {COLORS['accent_blue']}30, {COLORS['accent_blue']}15) !important;
-            color: {COLORS['text_primary']} !important;
-            border: 1px solid {COLORS['accent_blue']}50 !important;
-            border-radius: 8px !important;
-            padding: 8px 20px !important;
-            font-weight: 600 !important;
-            font-size: 13px !important;
-            transition: all 0.2s ease !important;
-        }}
-        .stButton > button:hover {{
-            background: linear-gradient(135deg, {COLORS['accent_blue']}50, {COLORS['accent_blue']}30) !important;
-            border-color: {COLORS['accent_blue']} !important;
-            box-shadow: 0 4px 12px {COLORS['accent_blue']}30 !important;
-            transform: translateY(-1px) !important;
-        }}
-        .stButton > button:active {{
-            transform: translateY(0) !important;
-        }}
-
-        /* ===== SELECT / INPUT WIDGETS ===== */
-        div[data-baseweb="select"] {{
-            background-color: {COLORS['bg_card']} !important;
-            border-radius: 8px !important;
-        }}
-        div[data-baseweb="select"] > div {{
-            background-color: {COLORS['bg_card']} !important;
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 8px !important;
-            color: #ffffff !important;
-            font-size: 14px !important;
-        }}
-        /* Dropdown popover container (aggressive to fix white background) */
-        div[data-baseweb="popover"],
-        div[data-baseweb="popover"] > div,
-        div[data-baseweb="popover"] ul,
-        ul[role="listbox"],
-        div[role="listbox"],
-        ul[data-testid="stSelectboxVirtualDropdown"] {{
-            background-color: {COLORS['bg_card']} !important;
-            border-color: {COLORS['border']} !important;
-        }}
-        /* Dropdown items (options) */
-        ul[role="listbox"] li,
-        ul[data-testid="stSelectboxVirtualDropdown"] li,
-        div[role="option"] {{
-            color: #ffffff !important;
-            font-size: 14px !important;
-            padding: 10px 16px !important;
-            background-color: {COLORS['bg_card']} !important; 
-        }}
-        ul[role="listbox"] li:hover,
-        ul[data-testid="stSelectboxVirtualDropdown"] li:hover,
-        div[role="option"]:hover {{
-            background-color: {COLORS['accent_blue']}40 !important;
-            color: #ffffff !important;
-        }}
-
-        /* Multi-select tags */
-        span[data-baseweb="tag"] {{
-            background: {COLORS['accent_blue']}25 !important;
-            color: {COLORS['accent_blue']} !important;
-            border: 1px solid {COLORS['accent_blue']}40 !important;
-            border-radius: 6px !important;
-        }}
-
-        /* Date input */
-        input[type="text"],
-        input[type="number"],
-        div[data-baseweb="input"] > div {{
-            background-color: {COLORS['bg_card']} !important;
-            color: {COLORS['text_primary']} !important;
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 6px !important;
-        }}
-
-        /* ===== DATE PICKER CALENDAR - FULL DARK OVERRIDE ===== */
-        div[data-baseweb="calendar"],
-        div[data-baseweb="datepicker"],
-        div[data-baseweb="calendar"] > div,
-        [data-baseweb="calendar"] * {{
-            background-color: {COLORS['bg_card']} !important;
-            color: #ffffff !important;
-        }}
-        /* Day cells */
-        div[data-baseweb="calendar"] button {{
-            background-color: {COLORS['bg_card']} !important;
-            color: #ffffff !important;
-            border: none !important;
-        }}
-        div[data-baseweb="calendar"] button:hover {{
-            background-color: {COLORS['accent_blue']}60 !important;
-            color: #ffffff !important;
-        }}
-        /* Selected day */
-        div[data-baseweb="calendar"] [aria-selected="true"],
-        div[data-baseweb="calendar"] [aria-selected="true"] * {{
-            background-color: {COLORS['accent_blue']} !important;
-            color: #ffffff !important;
-        }}
-        /* Month/year header text */
-        div[data-baseweb="calendar"] [data-baseweb="typo-label-medium"],
-        div[data-baseweb="calendar"] [data-baseweb="typo-paragraph-medium"],
-        div[data-baseweb="calendar"] span {{
-            color: #ffffff !important;
-        }}
-        /* Day-of-week labels (Mon, Tue, etc.) */
-        div[data-baseweb="calendar"] [role="columnheader"] {{
-            color: {COLORS['text_muted']} !important;
-        }}
-        /* Popover wrapper */
-        div[data-baseweb="popover"] > div {{
-            background-color: {COLORS['bg_card']} !important;
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 10px !important;
-        }}
-
-
-        /* ===== TABS ===== */
-        .stTabs [data-baseweb="tab-list"] {{
-            gap: 0px;
-            background-color: {COLORS['bg_card']};
-            border-radius: 8px;
-            padding: 4px;
-            border: 1px solid {COLORS['border']};
-        }}
-        .stTabs [data-baseweb="tab"] {{
-            color: {COLORS['text_secondary']};
-            border-radius: 6px;
-            padding: 8px 16px;
-            font-weight: 500;
-        }}
-        .stTabs [aria-selected="true"] {{
-            background-color: {COLORS['accent_blue']}25 !important;
-            color: {COLORS['accent_blue']} !important;
-            font-weight: 600;
-        }}
-
-        /* ===== EXPANDER (SMS/Briefing) ===== */
-        .streamlit-expanderHeader {{
-            background-color: {COLORS['bg_card']} !important;
-            border-radius: 8px !important;
-            color: {COLORS['text_primary']} !important;
-        }}
-        details[data-testid="stExpander"] {{
-            background-color: {COLORS['bg_card']} !important;
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 10px !important;
-        }}
-        details[data-testid="stExpander"] summary {{
-            color: {COLORS['text_primary']} !important;
-        }}
-        details[data-testid="stExpander"] > div {{
-            background-color: {COLORS['bg_card']} !important;
-        }}
-
-        /* ===== CODE BLOCKS (SMS templates etc.) ===== */
-        pre, code {{
-            background-color: {COLORS['bg_dark']} !important;
-            color: {COLORS['text_primary']} !important;
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 8px !important;
-        }}
-        .stCodeBlock {{
-            background-color: {COLORS['bg_dark']} !important;
-        }}
-        .stCodeBlock pre {{
-            background-color: {COLORS['bg_dark']} !important;
-            color: {COLORS['text_primary']} !important;
-            font-family: 'Consolas', 'Monaco', monospace !important;
-            font-size: 13px !important;
-            line-height: 1.6 !important;
-        }}
-        /* Override Streamlit's code block inner container */
-        [data-testid="stCodeBlock"] {{
-            background-color: {COLORS['bg_dark']} !important;
-        }}
-        [data-testid="stCodeBlock"] > div {{
-            background-color: {COLORS['bg_dark']} !important;
-        }}
-        [data-testid="stCodeBlock"] pre {{
-            background-color: {COLORS['bg_dark']} !important;
-            color: {COLORS['text_primary']} !important;
-        }}
-        [data-testid="stCodeBlock"] code {{
-            background-color: {COLORS['bg_dark']} !important;
-            color: {COLORS['text_primary']} !important;
-        }}
-
-        /* ===== DATAFRAME ===== */
-        .stDataFrame {{
-            border: 1px solid {COLORS['border']} !important;
-            border-radius: 8px !important;
-        }}
-
-        /* ===== METRIC CARDS ===== */
-        [data-testid="stMetric"] {{
-            background-color: {COLORS['bg_card']};
-            border: 1px solid {COLORS['border']};
-            border-radius: 10px;
-            padding: 16px;
-        }}
-
-        /* ===== SLIDER ===== */
-        .stSlider > div > div > div {{
-            color: {COLORS['text_primary']} !important;
-        }}
-
-        /* ===== INFO/WARNING/ERROR BOXES ===== */
-        .stAlert {{
-            background-color: {COLORS['bg_card']} !important;
-            border-radius: 8px !important;
-            color: {COLORS['text_primary']} !important;
-        }}
-
-        /* ===== DIVIDERS ===== */
-        hr {{
-            border-color: {COLORS['border']} !important;
-        }}
-
-        /* ===== LABELS ===== */
-        .stSelectbox label, .stMultiSelect label, .stSlider label, .stNumberInput label, .stDateInput label {{
-            color: {COLORS['text_muted']} !important;
-            font-size: 12px !important;
-            font-weight: 600 !important;
-        }}
-
-        /* ===== HIDE DEFAULT ELEMENTS ===== */
-        #MainMenu {{visibility: hidden;}}
-        footer {{visibility: hidden;}}
-
-        /* ===== FOLIUM MAP CONTAINER ===== */
-        iframe {{
-            border-radius: 12px !important;
-            border: 1px solid {COLORS['border']} !important;
-        }}
-
-        /* ===== SCROLLBAR ===== */
-        ::-webkit-scrollbar {{
-            width: 8px;
-            height: 8px;
-        }}
-        ::-webkit-scrollbar-track {{
-            background: {COLORS['bg_dark']};
-        }}
-        ::-webkit-scrollbar-thumb {{
-            background: {COLORS['border']};
-            border-radius: 4px;
-        }}
-        ::-webkit-scrollbar-thumb:hover {{
-            background: {COLORS['accent_blue']}60;
-        }}
-    </style>
+    """Return custom CSS for the entire Streamlit app (every fragment)."""
+    return _CACHED_CSS
+
+
+# Deliberately inline rather than <link>ed from ./static: static serving is
+# opt-in (server.enableStaticServing), and Streamlit releases before the
+# Starlette server serve .css from it as text/plain with nosniff, which
+# browsers refuse to apply. The fragments are at most ~1.7 KB once minified.
+def inject_css(components: Iterable[str] = ()) -> None:
     """
+    Emit the base fragments plus the given component scopes, each in its own
+    <style data-scope="..."> tag. Call once per page on every script run:
+    Streamlit drops any element a rerun does not re-emit, so a once-per-session
+    guard would unstyle the app after the first interaction. The tags share a
+    single markdown element so the page layout gets no extra vertical gap.
+    """
+    wanted = set(BASE_SCOPES).union(components)
+    unknown = wanted - CSS_FRAGMENTS.keys()
+    if unknown:
+        raise ValueError(f"Unknown CSS scope(s): {', '.join(sorted(unknown))}")
+    st.markdown(
+        "".join(css for scope, css in CSS_FRAGMENTS.items() if scope in wanted),
+        unsafe_allow_html=True,
+    )
+
+
+# Shared dark-theme Plotly layout; never handed out directly — get_plotly_layout
+# returns a fresh top-level dict, get_plotly_layout_mut a deep copy
+_BASE_LAYOUT = {
+    "template": "plotly_dark",
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "title": {
+        "text": "",
+        "font": {"color": COLORS["text_primary"], "size": 14},
+    },
+    "font": {"color": COLORS["text_primary"], "family": "Inter, sans-serif"},
+    "xaxis": {
+        "gridcolor": COLORS["border"],
+        "linecolor": COLORS["border"],
+    },
+    "yaxis": {
+        "gridcolor": COLORS["border"],
+        "linecolor": COLORS["border"],
+    },
+    "margin": {"l": 40, "r": 20, "t": 50, "b": 40},
+    "hovermode": "x unified",
+    "hoverlabel": {
+        "bgcolor": COLORS["bg_card"],
+        "font": {"color": "#ffffff", "size": 13, "family": "Inter, sans-serif"}
+    },
+    "legend": {
+        "orientation": "h",
+        "yanchor": "bottom",
+        "y": 1.02,
+        "xanchor": "right",
+        "x": 1,
+    },
+}
 
 
 def get_plotly_layout(title: str = "") -> dict:
-    """Get consistent Plotly layout for dark theme."""
-    return {
-        "template": "plotly_dark",
-        "paper_bgcolor": "rgba(0,0,0,0)",
-        "plot_bgcolor": "rgba(0,0,0,0)",
-        "title": {
-            "text": title,
-            "font": {"color": COLORS["text_primary"], "size": 14},
-        },
-        "font": {"color": COLORS["text_primary"], "family": "Inter, sans-serif"},
-        "xaxis": {
-            "gridcolor": COLORS["border"],
-            "linecolor": COLORS["border"],
-        },
-        "yaxis": {
-            "gridcolor": COLORS["border"],
-            "linecolor": COLORS["border"],
-        },
-        "margin": {"l": 40, "r": 20, "t": 50, "b": 40},
-        "hovermode": "x unified",
-        "hoverlabel": {
-            "bgcolor": COLORS["bg_card"],
-            "font": {"color": "#ffffff", "size": 13, "family": "Inter, sans-serif"}
-        },
-        "legend": {
-            "orientation": "h",
-            "yanchor": "bottom",
-            "y": 1.02,
-            "xanchor": "right",
-            "x": 1,
-        },
-    }
+    """
+    Get consistent Plotly layout for dark theme.
+    Returns a fresh top-level dict (with its own title dict) that can be passed
+    straight to go.Figure or extended. The nested sections (xaxis, yaxis, ...)
+    are shared: override them by spreading ({**layout["yaxis"], ...}), and use
+    get_plotly_layout_mut() to edit them in place.
+    """
+    return {**_BASE_LAYOUT, "title": {**_BASE_LAYOUT["title"], "text": title}}
+
+
+def get_plotly_layout_mut(title: str = "") -> dict:
+    """Get a private deep copy of the dark-theme layout, safe to mutate."""
+    layout = copy.deepcopy(_BASE_LAYOUT)
+    layout["title"]["text"] = title
+    return layout
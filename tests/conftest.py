@@ -0,0 +1,47 @@
+"""
+Shared pytest fixtures: the simulated datasets, loaded once per session.
+Tests must treat them as read-only.
+"""
+
+import pytest
+
+# Imports live inside the fixtures so a run that needs none of them
+# (e.g. -k theme) never pays for the data and model modules.
+
+
+@pytest.fixture(scope="session")
+def df_env():
+    from src.data.loaders import load_env_timeseries
+    return load_env_timeseries()
+
+
+@pytest.fixture(scope="session")
+def df_micro():
+    from src.data.loaders import load_micro_signals
+    return load_micro_signals()
+
+
+@pytest.fixture(scope="session")
+def df_vuln():
+    from src.data.loaders import load_vulnerability
+    return load_vulnerability()
+
+
+@pytest.fixture(scope="session")
+def kpis_json():
+    from src.data.loaders import load_kpis
+    return load_kpis()
+
+
+@pytest.fixture(scope="session")
+def full_kpis(df_env, df_micro, df_vuln):
+    from src.models.risk_engine import compute_all_kpis
+    return compute_all_kpis(df_env, df_micro, df_vuln)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _validation_cache():
+    """Drop memoized validator results when the session ends."""
+    yield
+    from src.data.validators import clear_validation_cache
+    clear_validation_cache()
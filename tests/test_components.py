@@ -0,0 +1,51 @@
+"""
+Tests for the chart downsampling helper.
+"""
+
+import numpy as np
+import pytest
+
+from src.ui.components import lttb, LTTB_MAX_POINTS
+
+
+N_IN = 5000
+N_OUT = 100
+
+
+@pytest.fixture
+def noisy():
+    rng = np.random.default_rng(0)
+    return np.arange(N_IN), rng.normal(size=N_IN).cumsum()
+
+
+class TestLttb:
+    """Test Largest-Triangle-Three-Buckets downsampling."""
+
+    @pytest.mark.parametrize("n", [1, N_OUT - 1, N_OUT])
+    def test_short_series_pass_through(self, n):
+        x, y = np.arange(n), np.linspace(0, 1, n)
+        out_x, out_y = lttb(x, y, N_OUT)
+        np.testing.assert_array_equal(out_x, x)
+        np.testing.assert_array_equal(out_y, y)
+
+    def test_output_has_n_out_points(self, noisy):
+        out_x, out_y = lttb(*noisy, N_OUT)
+        assert len(out_x) == len(out_y) == N_OUT
+        assert len(lttb(*noisy)[0]) == LTTB_MAX_POINTS
+
+    def test_keeps_first_and_last_points(self, noisy):
+        x, y = noisy
+        out_x, out_y = lttb(x, y, N_OUT)
+        assert (out_x[0], out_y[0]) == (x[0], y[0])
+        assert (out_x[-1], out_y[-1]) == (x[-1], y[-1])
+
+    def test_x_strictly_increasing(self, noisy):
+        out_x, _ = lttb(*noisy, N_OUT)
+        assert np.all(np.diff(out_x) > 0)
+
+    def test_spike_in_flat_series_survives(self):
+        x, y = np.arange(N_IN), np.zeros(N_IN)
+        y[1234] = 50.0
+        out_x, out_y = lttb(x, y, N_OUT)
+        assert 1234 in out_x
+        assert out_y.max() == 50.0
@@ -2,12 +2,8 @@
 Tests for risk engine calculations.
 """
 
-import os
-import sys
 import pytest
-
-# Add project root
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
 
 from src.models.risk_engine import (
     compute_heat_score,
@@ -18,51 +14,64 @@ from src.models.risk_engine import (
     compute_combined_stress,
     compute_icu_strain,
     compute_alert_level,
-    identify_drivers,
-    compute_all_kpis,
+    compute_alert_level_vec,
 )
-from src.data.loaders import load_env_timeseries, load_micro_signals, load_vulnerability
-
-
-class TestHeatScore:
-    """Test heat score computation."""
 
-    def test_heat_score_in_range(self):
-        score = compute_heat_score(35, 22)
-        assert 0 <= score <= 100
 
-    def test_heat_score_increases_with_temp(self):
-        low = compute_heat_score(25, 15)
-        high = compute_heat_score(40, 28)
-        assert high > low
+N_POINTS = 256
+RISING = np.linspace(0, 100, N_POINTS)
+TEMPS = np.linspace(20, 45, N_POINTS)
+NIGHT_TEMPS = np.linspace(10, 30, N_POINTS)
+PM25 = np.linspace(0, 150, N_POINTS)
+
+
+class TestVectorizedScores:
+    """Score a whole rising input sweep in one call per formula."""
+
+    @pytest.mark.parametrize("func, args, upper", [
+        pytest.param(compute_heat_score, (TEMPS, NIGHT_TEMPS), 100, id="heat"),
+        pytest.param(compute_pollution_score, (PM25,), 100, id="pollution"),
+        pytest.param(compute_micro_signal_score, (RISING,) * 3, 100, id="micro"),
+        pytest.param(compute_heat_respiratory_risk_index, (RISING,) * 4, 100, id="risk_index"),
+        pytest.param(compute_respiratory_surge_probability, (RISING, PM25, NIGHT_TEMPS), 100, id="surge"),
+        pytest.param(compute_combined_stress, (RISING,) * 2, 1.0, id="combined"),
+        pytest.param(compute_icu_strain, (RISING,) * 2, 40, id="icu"),
+    ])
+    def test_in_range_and_monotonic(self, func, args, upper):
+        scores = func(*args)
+        assert scores.shape == (N_POINTS,)
+        assert np.all((scores >= 0) & (scores <= upper))
+        assert np.all(np.diff(scores) >= 0)
+        assert scores[-1] > scores[0]
+
+    @pytest.mark.parametrize("func, lows, highs, upper", [
+        pytest.param(compute_heat_score, (15, 5), (50, 35), 100, id="heat"),
+        pytest.param(compute_pollution_score, (0,), (200,), 100, id="pollution"),
+        pytest.param(compute_micro_signal_score, (0,) * 3, (100,) * 3, 100, id="micro"),
+        pytest.param(compute_respiratory_surge_probability, (0, 0, 5), (100, 200, 35), 100, id="surge"),
+    ])
+    def test_in_range_on_random_inputs(self, func, lows, highs, upper):
+        rng = np.random.default_rng(0)
+        args = rng.uniform(lows, highs, size=(N_POINTS, len(lows))).T
+        scores = func(*args)
+        assert np.all((scores >= 0) & (scores <= upper))
 
-    def test_heat_score_nighttime_weight(self):
-        # Higher nighttime temp should increase score
-        low_night = compute_heat_score(35, 15)
-        high_night = compute_heat_score(35, 28)
-        assert high_night > low_night
 
+class TestHeatScore:
+    """Test heat score computation."""
 
-class TestPollutionScore:
-    """Test pollution score computation."""
-
-    def test_pollution_score_in_range(self):
-        score = compute_pollution_score(50)
-        assert 0 <= score <= 100
-
-    def test_pollution_score_increases_with_pm25(self):
-        low = compute_pollution_score(15)
-        high = compute_pollution_score(70)
-        assert high > low
+    def test_heat_score_monotone_in_day_and_night_temp(self):
+        temp, night = np.meshgrid(np.linspace(15, 45, 64), np.linspace(10, 30, 64))
+        scores = compute_heat_score(temp, night)
+        assert np.all(np.diff(scores, axis=1) >= -1e-9)  # daytime temp
+        assert np.all(np.diff(scores, axis=0) >= -1e-9)  # nighttime temp
+        assert np.all(scores[:, -1] > scores[:, 0])
+        assert np.all(scores[-1] > scores[0])
 
 
 class TestMicroSignalScore:
     """Test micro signal score computation."""
 
-    def test_micro_signal_in_range(self):
-        score = compute_micro_signal_score(50, 50, 50)
-        assert 0 <= score <= 100
-
     def test_micro_signal_weighted(self):
         # Search has highest weight (0.4)
         high_search = compute_micro_signal_score(100, 0, 0)
@@ -73,10 +82,6 @@ class TestMicroSignalScore:
 class TestHeatRespiratoryRiskIndex:
     """Test heat-respiratory risk index."""
 
-    def test_risk_index_in_range(self):
-        risk = compute_heat_respiratory_risk_index(50, 50, 50, 50)
-        assert 0 <= risk <= 100
-
     def test_risk_index_all_high(self):
         risk = compute_heat_respiratory_risk_index(100, 100, 100, 100)
         assert risk == 100
@@ -85,26 +90,46 @@ class TestHeatRespiratoryRiskIndex:
         risk = compute_heat_respiratory_risk_index(0, 0, 0, 0)
         assert risk == 0
 
+    def test_missing_pm25_saturates_like_scalar_baseline(self):
+        # A NaN reading normalizes to 100, as min(100, max(0, nan)) did
+        pollution = compute_pollution_score(float("nan"))
+        assert pollution == 100.0
+        assert compute_heat_respiratory_risk_index(60, pollution, 60, 60) == 70
+
+    def test_missing_pm25_saturates_on_arrays(self):
+        pollution = compute_pollution_score(np.array([np.nan, 10.0, 80.0]))
+        np.testing.assert_array_equal(pollution, [100.0, 0.0, 100.0])
+        risk = compute_heat_respiratory_risk_index(60, pollution, 60, 60)
+        np.testing.assert_array_equal(risk, [70, 45, 70])
+
+    def test_nan_risk_raises_on_scalars_and_arrays(self):
+        with pytest.raises(ValueError):
+            compute_heat_respiratory_risk_index(float("nan"), 0, 0, 0)
+        with pytest.raises(ValueError):
+            compute_heat_respiratory_risk_index(np.array([np.nan, 0.0]), 0, 0, 0)
+
 
 class TestSurgeProbability:
     """Test respiratory surge probability."""
 
-    def test_surge_prob_in_range(self):
-        prob = compute_respiratory_surge_probability(50, 50, 22)
-        assert 0 <= prob <= 100
-
-    def test_surge_prob_increases_with_inputs(self):
-        low = compute_respiratory_surge_probability(20, 20, 15)
-        high = compute_respiratory_surge_probability(80, 70, 28)
-        assert high > low
+    def test_surge_prob_monotone_in_every_input(self):
+        micro, pm25, night = np.meshgrid(
+            np.linspace(0, 100, 24), np.linspace(0, 150, 24), np.linspace(10, 30, 24), indexing="ij"
+        )
+        probs = compute_respiratory_surge_probability(micro, pm25, night)
+        for axis in range(3):
+            assert np.all(np.diff(probs, axis=axis) >= 0)
+        assert probs[-1, -1, -1] > probs[0, 0, 0]
 
 
 class TestCombinedStress:
     """Test combined respiratory stress index."""
 
-    def test_combined_in_range(self):
-        combined = compute_combined_stress(80, 70)
-        assert 0 <= combined <= 1.0
+    def test_combined_monotone_in_both_inputs(self):
+        hrr, sp = np.meshgrid(np.linspace(0, 100, 64), np.linspace(0, 100, 64))
+        combined = compute_combined_stress(hrr, sp)
+        assert np.all(np.diff(combined, axis=1) >= -1e-9)
+        assert np.all(np.diff(combined, axis=0) >= -1e-9)
 
     def test_combined_weights(self):
         # HeatResp has higher weight (0.6)
@@ -115,55 +140,59 @@ class TestCombinedStress:
 class TestICUStrain:
     """Test ICU strain computation."""
 
-    def test_icu_strain_in_range(self):
-        strain = compute_icu_strain(80, 70)
-        assert 0 <= strain <= 40
-
     def test_icu_strain_increases_with_risk(self):
         low = compute_icu_strain(10, 10)
         high = compute_icu_strain(80, 70)
         assert high > low
 
+    def test_icu_strain_array_matches_scalar(self):
+        hrr = np.array([10, 55, 80, 100])
+        sp = np.array([10, 40, 70, 100])
+        strain = compute_icu_strain(hrr, sp)
+        assert strain.tolist() == [compute_icu_strain(h, s) for h, s in zip(hrr.tolist(), sp.tolist())]
+
 
 class TestAlertLevel:
     """Test alert level determination."""
 
-    def test_emergency_level(self):
-        result = compute_alert_level(90, 75, 0.9, 35)
-        assert result["value"] == "EMERGENCY"
-
-    def test_warning_level(self):
-        result = compute_alert_level(72, 50, 0.67, 15)
-        assert result["value"] == "WARNING"
-
-    def test_watch_level(self):
-        result = compute_alert_level(60, 30, 0.45, 10)
-        assert result["value"] == "WATCH"
+    def test_levels_from_stacked_samples(self):
+        samples = np.array([[90, 75, 0.9, 35], [72, 50, 0.67, 15], [60, 30, 0.45, 10]])
+        levels, reasons = compute_alert_level_vec(*samples.T)
+        assert list(levels) == ["EMERGENCY", "WARNING", "WATCH"]
+        assert all(len(r) > 0 for r in reasons)
 
-    def test_alert_has_reason(self):
-        result = compute_alert_level(90, 75, 0.9, 35)
-        assert "reason" in result
-        assert len(result["reason"]) > 0
+    def test_vec_matches_scalar(self):
+        hrr, sp, combined, icu = (a.ravel() for a in np.meshgrid(
+            [30, 55, 70, 85], [20, 35, 55, 70], [0.4, 0.65], [15, 30], indexing="ij"
+        ))
+        levels, reasons = compute_alert_level_vec(hrr, sp, combined, icu)
+        for k in range(len(hrr)):
+            expected = compute_alert_level(hrr[k], sp[k], combined[k], icu[k])
+            assert (levels[k], reasons[k]) == (expected["value"], expected["reason"])
 
 
 class TestComputeAllKPIs:
-    """Test full KPI computation pipeline."""
-
-    def test_all_kpis_structure(self):
-        df_env = load_env_timeseries()
-        df_micro = load_micro_signals()
-        df_vuln = load_vulnerability()
-
-        kpis = compute_all_kpis(df_env, df_micro, df_vuln)
-
-        assert "location" in kpis
-        assert "period" in kpis
-        assert "kpis" in kpis
-        assert "drivers" in kpis
-
-        kpi_data = kpis["kpis"]
-        assert 0 <= kpi_data["heat_respiratory_risk_index"]["value"] <= 100
-        assert 0 <= kpi_data["respiratory_disease_surge_probability"]["value_pct"] <= 100
-        assert 0 <= kpi_data["combined_respiratory_stress_index"]["value"] <= 1.0
-        assert 0 <= kpi_data["icu_dual_load_risk"]["icu_strain_pct"] <= 40
-        assert kpi_data["alert_level"]["value"] in ["WATCH", "WARNING", "EMERGENCY"]
+    """Test full KPI computation pipeline (computed once per session)."""
+
+    def test_has_top_level_sections(self, full_kpis):
+        for key in ("location", "period", "kpis", "drivers"):
+            assert key in full_kpis
+
+    # (kpi, field, upper bound); every KPI value is bounded below by 0
+    KPI_BOUNDS = [
+        ("heat_respiratory_risk_index", "value", 100),
+        ("respiratory_disease_surge_probability", "value_pct", 100),
+        ("combined_respiratory_stress_index", "value", 1.0),
+        ("icu_dual_load_risk", "icu_strain_pct", 40),
+    ]
+
+    def test_kpi_values_in_bounds(self, full_kpis):
+        kpi_data = full_kpis["kpis"]
+        values = np.array([kpi_data[kpi][field] for kpi, field, _ in self.KPI_BOUNDS])
+        highs = np.array([high for _, _, high in self.KPI_BOUNDS])
+        assert np.all((values >= 0) & (values <= highs)), dict(zip(
+            (kpi for kpi, _, _ in self.KPI_BOUNDS), values.tolist()
+        ))
+
+    def test_alert_level_is_raised(self, full_kpis):
+        assert full_kpis["kpis"]["alert_level"]["value"] in ["WATCH", "WARNING", "EMERGENCY"]
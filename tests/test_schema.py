@@ -2,101 +2,135 @@
 Tests for data schema validation.
 """
 
-import json
-import os
-import sys
 import pytest
 
-# Add project root
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.data.validators import validate_kpi_json, validate_env_timeseries, validate_micro_signals, validate_vulnerability
-from src.data.loaders import load_kpis, load_env_timeseries, load_micro_signals, load_vulnerability
+from src.data import loaders
+from src.data.validators import (
+    validate_kpi_json, validate_env_timeseries, validate_micro_signals, validate_vulnerability,
+    clear_validation_cache,
+)
+from src.data.schema import KpiView
+from src.data.loaders import count_rows
 
 
 class TestKPISchema:
     """Test KPI JSON schema."""
 
-    def test_kpi_json_has_all_top_level_keys(self):
-        kpis = load_kpis()
-        errors = validate_kpi_json(kpis)
-        assert len(errors) == 0, f"Validation errors: {errors}"
-
-    def test_kpi_json_has_location(self):
-        kpis = load_kpis()
-        assert "location" in kpis
-        assert kpis["location"]["city"] == "Ankara"
-        assert kpis["location"]["country"] == "Turkey"
-
-    def test_kpi_json_has_period(self):
-        kpis = load_kpis()
-        assert "period" in kpis
-        assert "start" in kpis["period"]
-        assert "end" in kpis["period"]
-        assert "forecast_days" in kpis["period"]
-
-    def test_kpi_json_has_all_kpi_fields(self):
-        kpis = load_kpis()
-        kpi_data = kpis["kpis"]
-        assert "heat_respiratory_risk_index" in kpi_data
-        assert "respiratory_disease_surge_probability" in kpi_data
-        assert "combined_respiratory_stress_index" in kpi_data
-        assert "icu_dual_load_risk" in kpi_data
-        assert "alert_level" in kpi_data
-
-    def test_heat_respiratory_risk_has_required_fields(self):
-        kpis = load_kpis()
-        hr = kpis["kpis"]["heat_respiratory_risk_index"]
-        assert "value" in hr
-        assert "level" in hr
-        assert "delta_48h" in hr
-
-    def test_surge_probability_has_subtitle(self):
-        kpis = load_kpis()
-        sp = kpis["kpis"]["respiratory_disease_surge_probability"]
+    def test_kpi_json_matches_schema(self, kpis_json):
+        assert validate_kpi_json(kpis_json) == []
+
+    def test_computed_kpis_match_schema(self, full_kpis):
+        assert validate_kpi_json(full_kpis) == []
+
+    def test_out_of_range_value_is_reported(self, kpis_json):
+        bad = {**kpis_json, "kpis": {
+            **kpis_json["kpis"], "combined_respiratory_stress_index": {"value": 1.5},
+        }}
+        errors = validate_kpi_json(bad)
+        assert len(errors) == 1
+        assert "combined_respiratory_stress_index" in errors[0]
+
+    def test_kpi_json_has_location(self, kpis_json):
+        assert "location" in kpis_json
+        assert kpis_json["location"]["city"] == "Ankara"
+        assert kpis_json["location"]["country"] == "Turkey"
+
+    def test_kpi_json_has_period(self, kpis_json):
+        assert "period" in kpis_json
+        assert "start" in kpis_json["period"]
+        assert "end" in kpis_json["period"]
+        assert "forecast_days" in kpis_json["period"]
+
+    def test_surge_probability_has_subtitle(self, kpis_json):
+        sp = kpis_json["kpis"]["respiratory_disease_surge_probability"]
         assert "subtitle" in sp
         assert "COPD" in sp["subtitle"]
 
-    def test_drivers_is_list(self):
-        kpis = load_kpis()
-        assert isinstance(kpis["drivers"], list)
-        assert len(kpis["drivers"]) > 0
+    def test_drivers_is_list(self, kpis_json):
+        assert isinstance(kpis_json["drivers"], list)
+        assert len(kpis_json["drivers"]) > 0
+
+
+class TestKpiView:
+    """Test the flat KPI view used by the pages."""
+
+    def test_kpi_view_unpacks_kpis(self, kpis_json):
+        kv = KpiView.from_dict(kpis_json)
+        assert kv.hr_value == kpis_json["kpis"]["heat_respiratory_risk_index"]["value"]
+        assert kv.icu_strain_pct == kpis_json["kpis"]["icu_dual_load_risk"]["icu_strain_pct"]
+        assert kv.alert_value == kpis_json["kpis"]["alert_level"]["value"]
+
+    def test_kpi_view_defaults_on_empty(self):
+        kv = KpiView.from_dict({})
+        assert kv.hr_value == 0
+        assert kv.icu_peak_date == "N/A"
+        assert kv.alert_value == "WATCH"
 
 
 class TestEnvTimeseriesSchema:
     """Test environmental timeseries CSV."""
 
-    def test_env_csv_has_all_columns(self):
-        df = load_env_timeseries()
-        errors = validate_env_timeseries(df)
+    def test_env_csv_has_all_columns(self, df_env):
+        errors = validate_env_timeseries(df_env)
         assert len(errors) == 0, f"Validation errors: {errors}"
 
-    def test_env_csv_has_24_days(self):
-        df = load_env_timeseries()
-        assert len(df) == 24
+    def test_env_csv_has_24_days(self, df_env):
+        assert count_rows("env_timeseries") == df_env.shape[0] == 24
+
+    def test_revalidation_returns_fresh_copy(self, df_env):
+        first = validate_env_timeseries(df_env)
+        first.append("caller-side edit")
+        assert validate_env_timeseries(df_env) == []
+        assert validate_env_timeseries(df_env.iloc[:0]) == ["DataFrame is empty"]
+
+    def test_in_place_column_edits_are_seen(self, df_env):
+        df = df_env.copy()
+        assert validate_env_timeseries(df) == []
+        df.rename(columns={"pm25_ugm3": "pm25"}, inplace=True)
+        assert validate_env_timeseries(df) == ["Missing column: 'pm25_ugm3'"]
+        df.drop(columns="pm25", inplace=True)
+        assert validate_env_timeseries(df) == ["Missing column: 'pm25_ugm3'"]
+
+    def test_clear_cache_after_value_edit(self, df_vuln):
+        df = df_vuln.copy()
+        assert validate_vulnerability(df) == []
+        df.loc[0, "vulnerability_score"] = 150
+        clear_validation_cache()
+        assert validate_vulnerability(df) == ["vulnerability_score out of range [0,100]"]
 
 
 class TestMicroSignalsSchema:
     """Test micro signals CSV."""
 
-    def test_micro_csv_has_all_columns(self):
-        df = load_micro_signals()
-        errors = validate_micro_signals(df)
+    def test_micro_csv_has_all_columns(self, df_micro):
+        errors = validate_micro_signals(df_micro)
         assert len(errors) == 0, f"Validation errors: {errors}"
 
-    def test_micro_csv_has_24_days(self):
-        df = load_micro_signals()
-        assert len(df) == 24
+    def test_micro_csv_has_24_days(self, df_micro):
+        assert count_rows("micro_signals") == df_micro.shape[0] == 24
 
 
 class TestVulnerabilitySchema:
     """Test vulnerability CSV."""
 
-    def test_vuln_csv_has_all_columns(self):
-        df = load_vulnerability()
-        errors = validate_vulnerability(df)
+    def test_vuln_csv_has_all_columns(self, df_vuln):
+        errors = validate_vulnerability(df_vuln)
         assert len(errors) == 0, f"Validation errors: {errors}"
 
-    def test_vuln_csv_has_10_districts(self):
-        df = load_vulnerability()
-        assert len(df) == 10
+    def test_vuln_csv_has_10_districts(self, df_vuln):
+        assert count_rows("vulnerability") == df_vuln.shape[0] == 10
+
+
+class TestCountRows:
+    """Test the CSV row counter against read_csv's notion of a row."""
+
+    def test_quoted_newlines_and_empty_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loaders, "DATA_DIR", str(tmp_path))
+        (tmp_path / "simulated").mkdir()
+        csv_path = tmp_path / "simulated" / "baseline_vulnerability.csv"
+        csv_path.write_text('district,note\nA,"two\nlines"\n\nB,plain\n', encoding="utf-8")
+        assert count_rows("vulnerability") == 2
+        csv_path.write_text("", encoding="utf-8")
+        assert count_rows("vulnerability") == 0
+        with pytest.raises(ValueError):
+            count_rows("nope")
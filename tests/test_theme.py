@@ -0,0 +1,108 @@
+"""
+Tests for the UI theme constants.
+"""
+
+import re
+import pytest
+
+from src.ui.theme import (
+    COLORS, ALERT_COLORS, LEVEL_COLORS, ACCENT_BLUE_ALPHA,
+    BASE_SCOPES, CSS_FRAGMENTS, CSS_SHA256, get_custom_css, get_plotly_layout, get_plotly_layout_mut,
+)
+
+
+class TestThemeConstants:
+    """Guard the palette against drift."""
+
+    def test_alert_colors_cover_all_levels(self):
+        assert len(ALERT_COLORS) == 4
+        assert set(ALERT_COLORS) == {"NORMAL", "WATCH", "WARNING", "EMERGENCY"}
+        for colors in ALERT_COLORS.values():
+            assert set(colors) == {"bg", "border", "text"}
+
+    def test_colors_keys_frozen(self):
+        assert frozenset(COLORS) == frozenset({
+            "bg_dark", "bg_card", "bg_card_hover", "bg_sidebar",
+            "text_primary", "text_secondary", "text_muted",
+            "accent_blue", "accent_cyan", "accent_orange", "border",
+            "risk_low", "risk_med", "risk_high", "risk_emergency",
+            "watch", "warning", "emergency",
+            "gradient_green", "gradient_yellow", "gradient_orange", "gradient_red",
+        })
+
+    def test_level_colors_cover_risk_levels(self):
+        assert set(LEVEL_COLORS) == {"High", "Med", "Low"}
+
+    def test_palettes_are_read_only(self):
+        for mapping in (COLORS, LEVEL_COLORS, ALERT_COLORS, ALERT_COLORS["WATCH"]):
+            with pytest.raises(TypeError):
+                mapping["x"] = "#000000"
+
+    def test_accent_blue_alpha_is_8_digit_hex(self):
+        assert ACCENT_BLUE_ALPHA[38] == COLORS["accent_blue"] + "60"
+        for value in ACCENT_BLUE_ALPHA.values():
+            assert re.fullmatch(r"#[0-9a-f]{8}", value)
+
+
+class TestCustomCss:
+    """Test the prebuilt stylesheet."""
+
+    def test_css_is_minified(self):
+        css = get_custom_css()
+        assert css.startswith("<style")
+        assert css.endswith("</style>")
+        assert "/*" not in css
+        assert "\n" not in css
+        assert "  " not in css
+        assert " !important" not in css
+
+    def test_css_defines_every_palette_var(self):
+        css = CSS_FRAGMENTS["global"]
+        for key, value in COLORS.items():
+            assert f"--{key.replace('_', '-')}:{value};" in css
+
+    def test_every_referenced_var_is_defined(self):
+        css = get_custom_css()
+        defined = set(re.findall(r"(--[\w-]+):", css))
+        assert set(re.findall(r"var\((--[\w-]+)\)", css)) <= defined
+
+    def test_minify_keeps_descendant_pseudo_selectors(self):
+        css = get_custom_css()
+        assert 'div[data-baseweb="calendar"] :is(' in css
+
+    def test_no_universal_selectors(self):
+        assert "*" not in get_custom_css()
+
+    def test_each_fragment_is_its_own_scoped_tag(self):
+        for scope, css in CSS_FRAGMENTS.items():
+            assert css.startswith(f'<style data-scope="{scope}">')
+            assert css.count("<style") == 1
+        assert set(BASE_SCOPES) <= set(CSS_FRAGMENTS)
+
+    def test_csp_hashes_cover_each_fragment(self):
+        assert CSS_SHA256.keys() == CSS_FRAGMENTS.keys()
+        assert all(h.startswith("sha256-") and len(h) == 51 for h in CSS_SHA256.values())
+
+
+class TestPlotlyLayout:
+    """Test the shared Plotly layout accessors."""
+
+    def test_layout_is_accepted_by_figure(self):
+        import plotly.graph_objects as go
+        fig = go.Figure(layout=get_plotly_layout())
+        assert fig.layout.paper_bgcolor == "rgba(0,0,0,0)"
+
+    def test_layout_top_level_is_private(self):
+        get_plotly_layout()["height"] = 300
+        get_plotly_layout()["title"]["text"] = "X"
+        assert "height" not in get_plotly_layout()
+        assert get_plotly_layout()["title"]["text"] == ""
+
+    def test_titled_layout_does_not_leak_title(self):
+        assert get_plotly_layout("A")["title"]["text"] == "A"
+        assert get_plotly_layout()["title"]["text"] == ""
+
+    def test_mutable_layout_is_private(self):
+        layout = get_plotly_layout_mut("B")
+        layout["xaxis"]["range"] = [0, 1]
+        assert "range" not in get_plotly_layout()["xaxis"]
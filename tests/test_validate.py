@@ -0,0 +1,21 @@
+"""
+End-to-end pipeline validation against the simulated datasets.
+The live-data smoke check lives in scripts/validate_live.py.
+"""
+
+from datetime import datetime
+
+from src.data.real_data_fetcher import fetch_and_prepare
+from src.models.risk_engine import compute_all_kpis
+
+
+def test_pipeline(full_kpis):
+    assert full_kpis["kpis"]["alert_level"]["value"] in ["NORMAL", "WATCH", "WARNING", "EMERGENCY"]
+    assert full_kpis["last_update"]
+
+
+def test_fetched_pipeline(df_vuln):
+    df_env, df_micro = fetch_and_prepare(datetime(2025, 7, 1), datetime(2025, 7, 7))
+    assert len(df_env) == len(df_micro) == 7
+    kpis = compute_all_kpis(df_env, df_micro, df_vuln)
+    assert kpis["kpis"]["alert_level"]["value"] in ["NORMAL", "WATCH", "WARNING", "EMERGENCY"]